@@ -6,20 +6,27 @@ and returns a structured EnvironmentAnalysis result.
 """
 
 from __future__ import annotations
+import bisect
 import math
 import logging
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
 
 from met_core import (
+    c_to_k,
+    k_to_c,
     compute_cape_cin,
+    lift_parcel_moist,
+    sat_vapor_pressure,
     bunkers_storm_motion,
-    compute_srh,
-    bulk_shear,
+    uv_to_dir_spd,
+    compute_srh_layers,
+    bulk_shear_layers,
     mean_wind,
-    lapse_rate,
+    lapse_rate_layers,
     precipitable_water,
     supercell_composite,
     significant_tornado_parameter,
@@ -108,11 +115,48 @@ SUPPORT_LEVELS = [
     (5, "Extreme",  "red",    "🟥"),
 ]
 
+def support_score(mlcape, shear_06_kt, scp, stp, srh_01):
+    """
+    Numeric support score (0-5) from the scoring rungs.
+
+    Accepts scalars or equal-shape arrays — a gridded view can score
+    every cell with the same expression — and keeps the thresholds
+    tunable in one place.
+    """
+    mlcape      = np.asarray(mlcape, dtype=float)
+    shear_06_kt = np.asarray(shear_06_kt, dtype=float)
+    scp         = np.asarray(scp, dtype=float)
+    stp         = np.asarray(stp, dtype=float)
+    srh_01      = np.asarray(srh_01, dtype=float)
+
+    score = ((mlcape > 500).astype(np.int64)
+             + (mlcape > 1500)
+             + (shear_06_kt > 30)
+             + ((scp > 2) | (stp > 0.5))
+             + ((srh_01 > 200) & (stp >= 1.0)))
+    score = np.minimum(score, 5)
+    return int(score) if score.ndim == 0 else score
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CORE ANALYSIS FUNCTION
 # ─────────────────────────────────────────────────────────────────────────────
 
+_P500 = np.array([500.0])
+
+
+@lru_cache(maxsize=512)
+def _parcel_t500_k(t_lcl_k: float, p_lcl_hpa: float) -> float:
+    """
+    Moist-ascent parcel temperature at 500 hPa, memoized on quantized LCL
+    state. Adjacent forecast hours drift smoothly, so rounding the inputs
+    to 0.1 K / 0.1 hPa (far below sensor precision) makes repeat hours
+    and re-analyses of the same location cache hits instead of a fresh
+    iterative ascent each time.
+    """
+    return float(lift_parcel_moist(t_lcl_k, p_lcl_hpa, _P500)[0])
+
+
 def analyze_profile(profile: SoundingProfile) -> EnvironmentAnalysis:
     """Full analysis of a SoundingProfile. Returns EnvironmentAnalysis."""
     result = EnvironmentAnalysis(
@@ -149,21 +193,23 @@ def analyze_profile(profile: SoundingProfile) -> EnvironmentAnalysis:
     # Lifted Index proxy: T_500_env - T_500_parcel (negative = unstable)
     try:
         t_500 = float(np.interp(500.0, p[::-1], t[::-1]))
-        # Parcel lifted from surface dry-adiabatically to LCL, then moist to 500
-        from met_core import c_to_k, k_to_c, Rd, Cp
+        # ML parcel is moist above its LCL; the LCL pressure was already
+        # found during the CAPE pass, so reuse it rather than re-solving
+        # the Poisson relation here.
         t_parcel_lcl = result.ml_lcl_t_c
-        p_lcl = profile.p_sfc_hpa * (c_to_k(t_parcel_lcl) / c_to_k(profile.t_sfc_c)) ** (Cp / Rd)
+        p_lcl = cape_result["ml_lcl_p"]
         if p_lcl > 500:
-            from met_core import lift_parcel_moist
-            t500_parcel_k = float(lift_parcel_moist(c_to_k(t_parcel_lcl), p_lcl, np.array([500.0]))[0])
+            t500_parcel_k = _parcel_t500_k(round(c_to_k(t_parcel_lcl), 1), round(p_lcl, 1))
             result.li = round(t_500 - k_to_c(t500_parcel_k), 1)
     except Exception:
         result.li = round(-result.mlcape / 500.0, 1)   # rough proxy
 
     # ── LAPSE RATES ───────────────────────────────────────────────────────
     try:
-        result.lapse_700_500 = lapse_rate(h, t, 3000, 5500)   # ~700-500 hPa
-        result.lapse_sfc_700 = lapse_rate(h, t, 0, 3000)
+        # Both layers from one temperature interpolation pass
+        lapse = lapse_rate_layers(h, t)
+        result.lapse_700_500 = lapse[(3000.0, 5500.0)]   # ~700-500 hPa
+        result.lapse_sfc_700 = lapse[(0.0, 3000.0)]
     except Exception as e:
         logger.debug(f"Lapse rate error: {e}")
 
@@ -175,29 +221,40 @@ def analyze_profile(profile: SoundingProfile) -> EnvironmentAnalysis:
 
     # Surface RH approximation
     try:
-        from met_core import sat_vapor_pressure
         e_sfc  = sat_vapor_pressure(profile.td_sfc_c)
         es_sfc = sat_vapor_pressure(profile.t_sfc_c)
         result.rh_sfc = round(min(100.0, e_sfc / es_sfc * 100.0), 1)
     except Exception:
         result.rh_sfc = 60.0
 
+    # ── STABLE-CASE EARLY EXIT ────────────────────────────────────────────
+    # If no parcel clears the instability gate in _score_and_reason, the
+    # kinematics, composites, and boundary detection cannot change the
+    # outcome — skip them and return the "No Convective Threat" result.
+    if result.mlcape < 100 and result.mucape < 200:
+        result.boundary = {"boundary_detected": False, "boundary_type": "None",
+                           "max_gradient_k_per_100km": 0.0,
+                           "notes": ["Stable environment; boundary detection skipped."]}
+        _score_and_reason(result)
+        return result
+
     # ── KINEMATICS ────────────────────────────────────────────────────────
     try:
-        # Bulk shear layers
-        result.shear_01_kt = bulk_shear(h, u, v, 0, 1000)
-        result.shear_06_kt = bulk_shear(h, u, v, 0, 6000)
-        result.shear_36_kt = bulk_shear(h, u, v, 3000, 6000)
+        # Bulk shear layers — one interpolation pass for all three
+        shear = bulk_shear_layers(h, u, v)
+        result.shear_01_kt = shear[(0.0, 1000.0)]
+        result.shear_06_kt = shear[(0.0, 6000.0)]
+        result.shear_36_kt = shear[(3000.0, 6000.0)]
 
         # Bunkers storm motion
         bunk = bunkers_storm_motion(h, u, v)
         result.storm_motion_rm = (bunk["rm_u"], bunk["rm_v"])
-        from met_core import uv_to_dir_spd
         result.storm_dir_deg, result.storm_speed_kt = uv_to_dir_spd(bunk["rm_u"], bunk["rm_v"])
 
-        # SRH layers
-        result.srh_01 = compute_srh(h, u, v, bunk["rm_u"], bunk["rm_v"], layer_top_m=1000)
-        result.srh_03 = compute_srh(h, u, v, bunk["rm_u"], bunk["rm_v"], layer_top_m=3000)
+        # SRH layers (both from one storm-relative pass)
+        srh = compute_srh_layers(h, u, v, bunk["rm_u"], bunk["rm_v"], layer_tops_m=(1000.0, 3000.0))
+        result.srh_01 = srh[1000.0]
+        result.srh_03 = srh[3000.0]
 
         # Effective-layer SRH (simplified: use ML parcel inflow ~0-LCL as bottom)
         # A proper implementation requires effective_inflow_layer(), which is slow;
@@ -249,10 +306,32 @@ def analyze_profile(profile: SoundingProfile) -> EnvironmentAnalysis:
     return result
 
 
+def analyze_profiles(profiles: list) -> list:
+    """
+    Analyze a whole forecast window in one call.
+
+    Intended as a single run.cpu_bound target: shipping all profiles to
+    the worker process at once costs one pickle/IPC round-trip instead
+    of one per hour.
+    """
+    return [analyze_profile(p) for p in profiles]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SCORING & CONVECTIVE MODE REASONING
 # ─────────────────────────────────────────────────────────────────────────────
 
+# CIN severity ladder, ascending thresholds — bisect picks the rung with
+# one binary search (same data-driven pattern as the UI flag tables), and
+# adding a tier is a table edit rather than another elif.
+_CIN_THRESHOLDS = (-200.0, -75.0, -25.0)
+_CIN_MESSAGES = (
+    ("fail", "Extreme cap (CIN = {cin:.0f} J/kg) — initiation very unlikely without synoptic-scale forcing or mesoscale boundaries."),
+    ("fail", "Moderate cap (CIN = {cin:.0f} J/kg) — inhibits initiation; requires surface heating or boundary lifting."),
+    ("note", "Weak cap (CIN = {cin:.0f} J/kg) — modest inhibition, may help focus/organize storms."),
+)
+
+
 def _score_and_reason(r: EnvironmentAnalysis):
     """Mutates r in place to set support_score, mode, fail_modes, notes, warnings."""
 
@@ -268,12 +347,10 @@ def _score_and_reason(r: EnvironmentAnalysis):
         return
 
     # ── CIN gating ────────────────────────────────────────────────────────
-    if r.mlcin < -200:
-        fail_modes.append(f"Extreme cap (CIN = {r.mlcin:.0f} J/kg) — initiation very unlikely without synoptic-scale forcing or mesoscale boundaries.")
-    elif r.mlcin < -75:
-        fail_modes.append(f"Moderate cap (CIN = {r.mlcin:.0f} J/kg) — inhibits initiation; requires surface heating or boundary lifting.")
-    elif r.mlcin < -25:
-        notes.append(f"Weak cap (CIN = {r.mlcin:.0f} J/kg) — modest inhibition, may help focus/organize storms.")
+    rung = bisect.bisect_right(_CIN_THRESHOLDS, r.mlcin)
+    if rung < len(_CIN_MESSAGES):
+        bucket, template = _CIN_MESSAGES[rung]
+        (fail_modes if bucket == "fail" else notes).append(template.format(cin=r.mlcin))
 
     # ── LCL height (tornado proxy) ────────────────────────────────────────
     if r.ml_lcl_hgt > 2000:
@@ -367,13 +444,7 @@ def _score_and_reason(r: EnvironmentAnalysis):
             notes.append(bn)
 
     # ── Scoring ───────────────────────────────────────────────────────────
-    score = 0
-    if r.mlcape > 500:   score += 1
-    if r.mlcape > 1500:  score += 1
-    if r.shear_06_kt > 30: score += 1
-    if r.scp > 2 or r.stp > 0.5: score += 1
-    if r.srh_01 > 200 and r.stp >= 1.0: score += 1
-    score = min(score, 5)
+    score = support_score(r.mlcape, r.shear_06_kt, r.scp, r.stp, r.srh_01)
 
     r.support_score, r.support_label, r.support_color, r.support_emoji = SUPPORT_LEVELS[score]
     r.convective_mode = mode
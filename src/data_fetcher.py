@@ -12,17 +12,94 @@ Returns a unified SoundingProfile dataclass for each forecast hour.
 """
 
 from __future__ import annotations
+import json
 import math
 import logging
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import numpy as np
 
+try:
+    import orjson  # much faster decode for large numeric JSON arrays
+except ImportError:
+    orjson = None
+
+# Advertise brotli only when a decoder is importable — claiming "br"
+# without one would leave the response body undecodable.
+try:
+    import brotli  # noqa: F401  (used by urllib3 for decoding)
+    _ACCEPT_ENCODING = "br, gzip"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip"
+
+from met_core import dewpoint_from_rh, dir_spd_to_uv_vec
+
 logger = logging.getLogger(__name__)
 
+# One session for all upstream calls — keep-alive amortizes the TCP/TLS
+# handshake across geocoding, forecast, and outlook fetches. Compressed
+# responses cut the ~40 KB Open-Meteo payload to a few KB on the wire.
+# requests (and its urllib3 import chain) is loaded on first network use,
+# so consumers that only want SoundingProfile or parse_latlon — the
+# analysis worker processes, the test suite — skip it entirely.
+_HTTP = None
+
+
+def _session():
+    global _HTTP
+    if _HTTP is None:
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
+        _HTTP = requests.Session()
+        _HTTP.headers["Accept-Encoding"] = _ACCEPT_ENCODING
+        # A small dedicated pool (we talk to three hosts) plus two quick
+        # retries for transient connect/read failures; POST-free API, so
+        # retrying is safe.
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=(502, 503, 504)),
+        )
+        _HTTP.mount("https://", adapter)
+    return _HTTP
+
+
+# Upstream payloads are tens of KB; anything past this is a misbehaving
+# or hostile endpoint and gets dropped before it can exhaust memory.
+_MAX_RESPONSE_BYTES = 2_000_000
+
+
+def _decode_json(body: bytes):
+    """Decode a JSON body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _get_json(url: str, timeout, params: Optional[dict] = None):
+    """GET a JSON document through the shared session.
+
+    Single choke point for every upstream API call, so session, decoder,
+    and transfer policy changes apply uniformly. The body is streamed and
+    abandoned past _MAX_RESPONSE_BYTES rather than read whole into memory.
+    """
+    with _session().get(url, timeout=timeout, params=params, stream=True) as r:
+        r.raise_for_status()
+        buf = bytearray()
+        for chunk in r.iter_content(65536):
+            buf.extend(chunk)
+            if len(buf) > _MAX_RESPONSE_BYTES:
+                raise ValueError(
+                    f"Response from {url.split('?', 1)[0]} exceeded "
+                    f"{_MAX_RESPONSE_BYTES} bytes; rejecting"
+                )
+    return _decode_json(bytes(buf))
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DATA STRUCTURES
@@ -65,25 +142,133 @@ class SoundingProfile:
 # GEOCODING
 # ─────────────────────────────────────────────────────────────────────────────
 
+def parse_latlon(raw: str) -> Optional[tuple]:
+    """Parse a 'lat, lon' string. Returns (lat, lon, display_name) or None."""
+    parts = [p.strip() for p in raw.split(",")]
+    if len(parts) != 2:
+        return None
+    try:
+        lat = float(parts[0])
+        lon = float(parts[1])
+    except ValueError:
+        return None
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon, f"{lat:.3f}, {lon:.3f}"
+    return None
+
+
+# Place-name lookups are stable, so hits are cached for the process
+# lifetime; only lookup failures are retried.
+_GEO_CACHE: dict = {}
+_GEO_CACHE_MAX = 256
+
+
+def _cache_put(cache: dict, key, value, maxsize: int) -> None:
+    """Insert into a bounded dict cache, evicting the oldest entry when full."""
+    if key not in cache and len(cache) >= maxsize:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
 def geocode(location_str: str) -> Optional[tuple]:
     """Returns (lat, lon, display_name) or None."""
-    url = (
-        f"https://geocoding-api.open-meteo.com/v1/search"
-        f"?name={requests.utils.quote(location_str)}&count=1&language=en&format=json"
-    )
+    cache_key = location_str.strip().lower()
+    cached = _GEO_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        r = requests.get(url, timeout=8).json()
+        r = _get_json(
+            "https://geocoding-api.open-meteo.com/v1/search",
+            timeout=8,
+            params={"name": location_str, "count": 1,
+                    "language": "en", "format": "json"},
+        )
         if r.get("results"):
             res = r["results"][0]
             name = res.get("name", location_str)
             country = res.get("country", "")
             display = f"{name}, {country}" if country else name
-            return res["latitude"], res["longitude"], display
+            result = (res["latitude"], res["longitude"], display)
+            _cache_put(_GEO_CACHE, cache_key, result, _GEO_CACHE_MAX)
+            return result
     except Exception as e:
         logger.warning(f"Geocode failed: {e}")
     return None
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# SPC DAY-1 CATEGORICAL OUTLOOK
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Structured GeoJSON product — a few KB, unlike the full KML download.
+SPC_DAY1_URL = "https://www.spc.noaa.gov/products/outlook/day1otlk_cat.nolyr.geojson"
+
+# Categorical ranks, least → most significant
+_SPC_RANK = {"TSTM": 0, "MRGL": 1, "SLGT": 2, "ENH": 3, "MDT": 4, "HIGH": 5}
+
+_SPC_CACHE: list = []          # single (fetched_at, geojson) entry
+_SPC_CACHE_TTL_S = 900.0
+
+
+def _point_in_ring(lon: float, lat: float, ring: list) -> bool:
+    """Ray-casting point-in-polygon test for one GeoJSON ring."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def get_spc_outlook(lat: float, lon: float) -> Optional[dict]:
+    """
+    Highest SPC Day-1 categorical outlook containing the point.
+
+    Parses the GeoJSON product structurally (one pass over the feature
+    polygons) rather than substring-scanning a KML dump, and caches the
+    document for 15 minutes. Returns {"label": ..., "name": ...} or None
+    if the point is in no outlook area or the fetch fails.
+    """
+    now = time.monotonic()
+    if _SPC_CACHE and now - _SPC_CACHE[0][0] < _SPC_CACHE_TTL_S:
+        geo = _SPC_CACHE[0][1]
+    else:
+        try:
+            geo = _get_json(SPC_DAY1_URL, timeout=(3, 5))
+        except Exception as e:
+            logger.warning(f"SPC outlook fetch failed: {e}")
+            return None
+        _SPC_CACHE[:] = [(now, geo)]
+
+    best = None
+    for feat in geo.get("features", []):
+        props = feat.get("properties") or {}
+        rank = _SPC_RANK.get(props.get("LABEL"))
+        if rank is None:
+            continue
+        geom = feat.get("geometry") or {}
+        if geom.get("type") == "Polygon":
+            polys = [geom.get("coordinates", [])]
+        elif geom.get("type") == "MultiPolygon":
+            polys = geom.get("coordinates", [])
+        else:
+            continue
+        for rings in polys:
+            if not rings:
+                continue
+            if _point_in_ring(lon, lat, rings[0]) and \
+                    not any(_point_in_ring(lon, lat, hole) for hole in rings[1:]):
+                if best is None or rank > best[0]:
+                    best = (rank, {"label": props.get("LABEL"),
+                                   "name": props.get("LABEL2", props.get("LABEL"))})
+                break
+    return best[1] if best else None
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # HERBIE-BASED MODEL FETCHER
 # ─────────────────────────────────────────────────────────────────────────────
@@ -99,6 +284,14 @@ def _herbie_available() -> bool:
 PRESSURE_LEVELS = [1000, 975, 950, 925, 900, 875, 850, 825, 800,
                    775, 750, 700, 650, 600, 550, 500, 450, 400, 350, 300, 250, 200]
 
+MS_TO_KT = 1.94384  # m/s -> knots
+K_TO_C   = 273.15
+
+def _nearest_point(ds, lat: float, lon: float):
+    """Nearest-neighbor point selection from a Herbie xarray dataset."""
+    return ds.sel(latitude=lat, longitude=lon, method="nearest")
+
+
 def _fetch_herbie(lat: float, lon: float, model: str, fxx: int) -> Optional[SoundingProfile]:
     """
     Fetch a vertical profile from HRRR, NAM, or GFS using Herbie.
@@ -133,29 +326,41 @@ def _fetch_herbie(lat: float, lon: float, model: str, fxx: int) -> Optional[Soun
         ds_hgt = H.xarray(":HGT:(?:{}(?= mb))".format("|".join(str(p) for p in PRESSURE_LEVELS)))
         ds_sfc = H.xarray(":(TMP|DPT|PRES):2 m above")
 
-        def nearest(ds, lat, lon):
-            return ds.sel(latitude=lat, longitude=lon, method="nearest")
-
-        # Extract point profiles
+        # Extract point profiles — select the point once per dataset, not
+        # once per level.
+        pt_t, pt_rh, pt_u, pt_v, pt_z = (
+            _nearest_point(ds, lat, lon) for ds in (ds_t, ds_rh, ds_u, ds_v, ds_hgt)
+        )
         p_arr   = np.array(PRESSURE_LEVELS, dtype=float)
-        t_arr   = np.array([float(nearest(ds_t,  lat, lon)["t"].sel(isobaricInhPa=p).values) - 273.15
+        t_arr   = np.array([float(pt_t["t"].sel(isobaricInhPa=p).values)
+                            for p in PRESSURE_LEVELS])
+        t_arr  -= K_TO_C
+        rh_arr  = np.array([float(pt_rh["r"].sel(isobaricInhPa=p).values)
                             for p in PRESSURE_LEVELS])
-        rh_arr  = np.array([float(nearest(ds_rh, lat, lon)["r"].sel(isobaricInhPa=p).values)
+        u_arr   = np.array([float(pt_u["u"].sel(isobaricInhPa=p).values)
                             for p in PRESSURE_LEVELS])
-        u_arr   = np.array([float(nearest(ds_u,  lat, lon)["u"].sel(isobaricInhPa=p).values) * 1.94384
-                            for p in PRESSURE_LEVELS])  # m/s → kt
-        v_arr   = np.array([float(nearest(ds_v,  lat, lon)["v"].sel(isobaricInhPa=p).values) * 1.94384
+        v_arr   = np.array([float(pt_v["v"].sel(isobaricInhPa=p).values)
                             for p in PRESSURE_LEVELS])
-        z_arr   = np.array([float(nearest(ds_hgt, lat, lon)["gh"].sel(isobaricInhPa=p).values)
+        u_arr  *= MS_TO_KT  # m/s → kt, once per array rather than per level
+        v_arr  *= MS_TO_KT
+        z_arr   = np.array([float(pt_z["gh"].sel(isobaricInhPa=p).values)
                             for p in PRESSURE_LEVELS])  # m MSL
 
-        # Dewpoint from RH and T: Td = T - (100 - RH)/5 (Magnus approximation)
-        td_arr  = t_arr - (100.0 - rh_arr) / 5.0
+        # Same defaults as the Open-Meteo path: GRIB points can carry NaN
+        # for below-ground or masked levels, and one NaN would otherwise
+        # propagate through the CAPE integration and shear hypotenuses.
+        np.nan_to_num(t_arr,  nan=0.0,  copy=False)
+        np.nan_to_num(rh_arr, nan=50.0, copy=False)
+        np.nan_to_num(u_arr,  nan=0.0,  copy=False)
+        np.nan_to_num(v_arr,  nan=0.0,  copy=False)
+        np.nan_to_num(z_arr,  nan=0.0,  copy=False)
+
+        td_arr  = dewpoint_from_rh(t_arr, rh_arr)
 
         # Surface
-        sfc_pt = nearest(ds_sfc, lat, lon)
-        t_sfc  = float(sfc_pt["t2m"].values)  - 273.15
-        td_sfc = float(sfc_pt["d2m"].values)  - 273.15
+        sfc_pt = _nearest_point(ds_sfc, lat, lon)
+        t_sfc  = float(sfc_pt["t2m"].values)  - K_TO_C
+        td_sfc = float(sfc_pt["d2m"].values)  - K_TO_C
         p_sfc  = float(sfc_pt["sp"].values)   / 100.0  # Pa → hPa
 
         # Heights AGL
@@ -177,8 +382,8 @@ def _fetch_herbie(lat: float, lon: float, model: str, fxx: int) -> Optional[Soun
         try:
             lat_slice = slice(lat - 3, lat + 3)
             lon_slice = slice(lon - 3, lon + 3)
-            g_t  = ds_sfc["t2m"].sel(latitude=lat_slice, longitude=lon_slice).values - 273.15
-            g_td = ds_sfc["d2m"].sel(latitude=lat_slice, longitude=lon_slice).values - 273.15
+            g_t  = ds_sfc["t2m"].sel(latitude=lat_slice, longitude=lon_slice).values - K_TO_C
+            g_td = ds_sfc["d2m"].sel(latitude=lat_slice, longitude=lon_slice).values - K_TO_C
             g_p  = ds_sfc["sp"].sel(latitude=lat_slice, longitude=lon_slice).values / 100.0
             g_la = ds_sfc.latitude.sel(latitude=lat_slice).values
             g_lo = ds_sfc.longitude.sel(longitude=lon_slice).values
@@ -211,85 +416,194 @@ def _fetch_herbie(lat: float, lon: float, model: str, fxx: int) -> Optional[Soun
 OM_LEVELS = [1000, 975, 950, 925, 900, 875, 850, 800, 750, 700,
              650, 600, 550, 500, 450, 400, 350, 300, 250, 200]
 
+# Open-Meteo refreshes its hourly forecasts roughly hourly; repeat analyses
+# of the same point within the TTL reuse the parsed response and skip the
+# network round-trip entirely.
+_OM_CACHE: dict = {}
+_OM_CACHE_TTL_S = 600.0
+_OM_CACHE_MAX = 64
+
+# The hourly variable list never changes — build the query string once at
+# import instead of re-joining ~100 variable names per fetch.
+_OM_HOURLY_VARS = ",".join(
+    [f"{var}_{l}hPa" for var in ("temperature", "relative_humidity", "windspeed",
+                                 "winddirection", "geopotential_height")
+     for l in OM_LEVELS]
+    + ["temperature_2m", "dewpoint_2m", "surface_pressure",
+       "cape", "convective_inhibition", "lifted_index"]
+)
+
+# Static portion of the forecast query, assembled once at import; per-call
+# construction only interpolates coordinates and the day count.
+# unixtime keeps the hour axis numeric: one int array instead of ~1.5 KB
+# of ISO strings per response, and the stamps convert to datetime64 in a
+# single cast. Timestamps are UTC epoch seconds regardless of the
+# location's zone, which is also what the profiles assume.
+_OM_STATIC_QS = (f"&hourly={_OM_HOURLY_VARS}&wind_speed_unit=kn"
+                 f"&timezone=auto&timeformat=unixtime")
+
+
+def _to_float_array(values, default: float, n: int) -> np.ndarray:
+    """
+    Convert a column list (or list of columns) to float64 with None/NaN
+    replaced by ``default`` in one branchless pass. A missing/empty
+    ``values`` — hourly.get() returning None — yields a default-filled
+    array of length ``n``.
+    """
+    if values is None or len(values) == 0:
+        return np.full(n, default)
+    return np.nan_to_num(np.array(values, dtype=np.float64), nan=default, copy=False)
+
+
+@dataclass
+class _HourlyStack:
+    """
+    Structure-of-arrays view of an Open-Meteo hourly payload.
+
+    Column i of every matrix is the vertical profile for hour i; building
+    the stack performs all None-coalescing, dewpoint/height derivation,
+    and wind trig exactly once, so slicing out an hour is free.
+    """
+    stamps:      list
+    valid_hours: np.ndarray
+    t_mat:       np.ndarray      # (n_levels, n_hours), degC
+    td_mat:      np.ndarray
+    h_mat:       np.ndarray      # m AGL
+    u_mat:       np.ndarray      # kt
+    v_mat:       np.ndarray
+    t2m:         np.ndarray      # (n_hours,) surface series
+    td2m:        np.ndarray
+    psfc:        np.ndarray
+
+    @classmethod
+    def from_hourly(cls, hourly: dict, forecast_hours: int) -> "_HourlyStack":
+        times = hourly.get("time", [])
+        n = len(times)
+        # Columns past the requested window are never consumed (the API
+        # rounds up to whole days), so trim before the derivation passes
+        # rather than running dewpoint/trig over hours that get discarded.
+        m = min(n, forecast_hours)
+
+        # Bind each per-level column list once — per-hour access would
+        # otherwise repeat the dict lookup (and allocate the default list)
+        # for every level of every hour.
+        _missing = [None] * n
+        t_cols  = [hourly.get(f"temperature_{p}hPa",         _missing) for p in OM_LEVELS]
+        rh_cols = [hourly.get(f"relative_humidity_{p}hPa",   _missing) for p in OM_LEVELS]
+        ws_cols = [hourly.get(f"windspeed_{p}hPa",           _missing) for p in OM_LEVELS]
+        wd_cols = [hourly.get(f"winddirection_{p}hPa",       _missing) for p in OM_LEVELS]
+        z_cols  = [hourly.get(f"geopotential_height_{p}hPa", _missing) for p in OM_LEVELS]
+
+        # Stack columns into (n_levels, n_hours) matrices in one pass; None
+        # becomes NaN and is backfilled in place with the same defaults as
+        # before (copy=False avoids a second matrix-sized allocation each).
+        t_raw  = np.array(t_cols, dtype=np.float64)[:, :m]
+        # Hours with no upper-air data at all (all-NaN temperature column,
+        # e.g. past the end of the model run) are masked out in one
+        # vectorized pass here; letting the defaults through would
+        # fabricate an isothermal 0 degC profile for those hours.
+        valid_hours = np.isfinite(t_raw).any(axis=0)
+        t_mat  = np.nan_to_num(t_raw, nan=0.0, copy=False)
+        rh_mat = _to_float_array(rh_cols, 50.0, n)[:, :m]
+        ws_mat = _to_float_array(ws_cols, 0.0,  n)[:, :m]
+        wd_mat = _to_float_array(wd_cols, 0.0,  n)[:, :m]
+        z_mat  = _to_float_array(z_cols,  0.0,  n)[:, :m]
+
+        # Dewpoint for every level and hour at once; rh_mat is not needed
+        # afterwards, so it doubles as the output buffer.
+        td_mat = dewpoint_from_rh(t_mat, rh_mat, out=rh_mat)
+
+        # Heights AGL for every hour at once, reusing z_mat as the buffer.
+        z_sfc_row = np.maximum(z_mat[0], 0.0)
+        np.subtract(z_mat, z_sfc_row, out=z_mat)
+        np.maximum(z_mat, 0.0, out=z_mat)
+
+        # U/V for every level and hour with one trig pass over the whole
+        # matrices, instead of one dir_spd_to_uv_vec call per hour.
+        u_mat, v_mat = dir_spd_to_uv_vec(wd_mat, ws_mat)
+
+        # Unix epoch seconds convert to datetime64 in one cast; fall back
+        # to ISO parsing (vectorized, then per-item) for older cached
+        # responses that predate the unixtime switch.
+        window = times[:m]
+        try:
+            stamps = np.asarray(window, dtype=np.int64).astype("datetime64[s]").tolist()
+        except (ValueError, TypeError, OverflowError):
+            try:
+                stamps = np.array(window, dtype="datetime64[s]").tolist()
+            except ValueError:
+                stamps = []
+                for t_str in window:
+                    try:
+                        stamps.append(datetime.fromisoformat(t_str))
+                    except (TypeError, ValueError):
+                        stamps.append(None)
+
+        return cls(
+            stamps=stamps, valid_hours=valid_hours,
+            t_mat=t_mat, td_mat=td_mat, h_mat=z_mat, u_mat=u_mat, v_mat=v_mat,
+            t2m=_to_float_array(hourly.get("temperature_2m"),   0.0,    n)[:m],
+            td2m=_to_float_array(hourly.get("dewpoint_2m"),      0.0,    n)[:m],
+            psfc=_to_float_array(hourly.get("surface_pressure"), 1013.0, n)[:m],
+        )
+
+    def to_profiles(self, lat: float, lon: float) -> list:
+        """One SoundingProfile per valid hour, as column views of the stack."""
+        p_arr = np.array(OM_LEVELS, dtype=float)  # bottom->top (descending pressure)
+        profiles = []
+        for i, stamp in enumerate(self.stamps):
+            if stamp is None or not self.valid_hours[i]:
+                continue
+            try:
+                profiles.append(SoundingProfile(
+                    valid_time=stamp.replace(tzinfo=timezone.utc),
+                    source="Open-Meteo",
+                    lat=lat, lon=lon,
+                    p_hpa=p_arr,
+                    t_c=self.t_mat[:, i], td_c=self.td_mat[:, i],
+                    heights_m_agl=self.h_mat[:, i],
+                    u_kt=self.u_mat[:, i], v_kt=self.v_mat[:, i],
+                    t_sfc_c=float(self.t2m[i]), td_sfc_c=float(self.td2m[i]),
+                    p_sfc_hpa=float(self.psfc[i]),
+                ))
+            except Exception as e:
+                logger.debug(f"Hour {i} profile build failed: {e}")
+                continue
+        return profiles
+
+
 def _fetch_open_meteo(lat: float, lon: float, forecast_hours: int = 48) -> Optional[list[SoundingProfile]]:
     """
     Fetch multi-hour profiles from Open-Meteo.
     Returns list of SoundingProfile (one per hour).
     """
-    level_str = ",".join(str(l) for l in OM_LEVELS)
-    t_vars  = ",".join(f"temperature_{l}hPa"   for l in OM_LEVELS)
-    rh_vars = ",".join(f"relative_humidity_{l}hPa" for l in OM_LEVELS)
-    u_vars  = ",".join(f"windspeed_{l}hPa"     for l in OM_LEVELS)
-    d_vars  = ",".join(f"winddirection_{l}hPa" for l in OM_LEVELS)
-    z_vars  = ",".join(f"geopotential_height_{l}hPa" for l in OM_LEVELS)
-
     url = (
         f"https://api.open-meteo.com/v1/forecast"
         f"?latitude={lat}&longitude={lon}"
-        f"&hourly={t_vars},{rh_vars},{u_vars},{d_vars},{z_vars},"
-        f"temperature_2m,dewpoint_2m,surface_pressure,"
-        f"cape,convective_inhibition,lifted_index"
-        f"&wind_speed_unit=kn&timezone=auto&forecast_days={max(1, forecast_hours // 24 + 1)}"
+        # Ceiling division: request exactly the days that cover the window
+        # (24h -> 1 day, 48h -> 2), not a whole extra day of payload.
+        f"{_OM_STATIC_QS}&forecast_days={max(1, (forecast_hours + 23) // 24)}"
     )
 
+    # Cache the finished profiles, not the raw response — a hit skips the
+    # JSON decode and the whole matrix build, not just the network.
+    cache_key = (round(lat, 2), round(lon, 2), forecast_hours)
+    cached = _OM_CACHE.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < _OM_CACHE_TTL_S:
+        return cached[1]
+
     try:
-        r = requests.get(url, timeout=15).json()
+        r = _get_json(url, timeout=15)
     except Exception as e:
         logger.error(f"Open-Meteo fetch failed: {e}")
         return None
 
-    hourly = r.get("hourly", {})
-    times  = hourly.get("time", [])
-    tz_abbr = r.get("timezone_abbreviation", "UTC")
-    profiles = []
-
-    for i, t_str in enumerate(times[:forecast_hours]):
-        try:
-            valid_time = datetime.fromisoformat(t_str).replace(tzinfo=timezone.utc)
-
-            p_arr  = np.array(OM_LEVELS[::-1], dtype=float)   # sort asc altitude = desc pressure
-            t_arr  = np.array([hourly.get(f"temperature_{p}hPa",  [None]*len(times))[i] or 0.0
-                               for p in OM_LEVELS[::-1]])
-            rh_arr = np.array([hourly.get(f"relative_humidity_{p}hPa", [None]*len(times))[i] or 50.0
-                               for p in OM_LEVELS[::-1]])
-            u_raw  = np.array([hourly.get(f"windspeed_{p}hPa",    [None]*len(times))[i] or 0.0
-                               for p in OM_LEVELS[::-1]])
-            d_raw  = np.array([hourly.get(f"winddirection_{p}hPa", [None]*len(times))[i] or 0.0
-                               for p in OM_LEVELS[::-1]])
-            z_arr  = np.array([hourly.get(f"geopotential_height_{p}hPa", [None]*len(times))[i] or 0.0
-                               for p in OM_LEVELS[::-1]])
-
-            # Dewpoint from RH
-            td_arr = t_arr - (100.0 - rh_arr) / 5.0
-
-            # U/V from speed + direction
-            u_arr = np.array([-float(u_raw[j]) * math.sin(math.radians(float(d_raw[j])))
-                              for j in range(len(u_raw))])
-            v_arr = np.array([-float(u_raw[j]) * math.cos(math.radians(float(d_raw[j])))
-                              for j in range(len(u_raw))])
-
-            # Heights AGL
-            z_sfc = float(z_arr[0]) if z_arr[0] > 0 else 0.0
-            h_agl = np.maximum(z_arr - z_sfc, 0.0)
-
-            # Surface
-            t_sfc  = hourly.get("temperature_2m",  [0.0]*len(times))[i] or 0.0
-            td_sfc = hourly.get("dewpoint_2m",      [0.0]*len(times))[i] or 0.0
-            p_sfc  = hourly.get("surface_pressure", [1013.0]*len(times))[i] or 1013.0
-
-            profiles.append(SoundingProfile(
-                valid_time=valid_time,
-                source="Open-Meteo",
-                lat=lat, lon=lon,
-                p_hpa=p_arr, t_c=t_arr, td_c=td_arr,
-                heights_m_agl=h_agl, u_kt=u_arr, v_kt=v_arr,
-                t_sfc_c=float(t_sfc), td_sfc_c=float(td_sfc), p_sfc_hpa=float(p_sfc),
-            ))
-        except Exception as e:
-            logger.debug(f"Hour {i} profile build failed: {e}")
-            continue
-
-    return profiles if profiles else None
+    stack = _HourlyStack.from_hourly(r.get("hourly", {}), forecast_hours)
+    profiles = stack.to_profiles(lat, lon)
+    if profiles:
+        _cache_put(_OM_CACHE, cache_key, (time.monotonic(), profiles), _OM_CACHE_MAX)
+        return profiles
+    return None
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -320,15 +634,17 @@ def fetch_profiles(
 
         for model, max_fxx in [("HRRR", 18), ("NAM", 60), ("GFS", 120)]:
             _progress(f"Trying {model}…")
-            profiles = []
-            failed = False
-
-            for fxx in range(0, min(forecast_hours, max_fxx) + 1, 3):
-                prof = _fetch_herbie(lat, lon, model, fxx)
-                if prof is None:
-                    failed = True
-                    break
-                profiles.append(prof)
+            fxx_steps = range(0, min(forecast_hours, max_fxx) + 1, 3)
+
+            # The per-hour GRIB fetches are independent network round trips;
+            # overlap them so total wait is bounded by the slowest fetch
+            # rather than the sum.  map() preserves fxx order.
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(
+                    lambda fxx: _fetch_herbie(lat, lon, model, fxx), fxx_steps))
+
+            profiles = [p for p in results if p is not None]
+            failed = len(profiles) != len(results)
 
             if not failed and profiles:
                 _progress(f"✓ Using {model} ({len(profiles)} forecast steps)")
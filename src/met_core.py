@@ -18,6 +18,14 @@ import math
 import numpy as np
 from typing import Optional
 
+# Optional accelerator, same spirit as the orjson/brotli soft imports in
+# data_fetcher: when numba is installed the moist-ascent kernel below is
+# compiled to native code; without it the tuned interpreted loop runs.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CONSTANTS
@@ -31,6 +39,24 @@ g    = 9.81     # m s-2       gravitational acceleration
 eps  = Rd / Rv  # 0.622
 T0   = 273.15   # K
 
+DEG2RAD = math.pi / 180.0
+
+# np.trapz was removed in NumPy 2.x in favor of np.trapezoid.
+_trapz = getattr(np, "trapezoid", getattr(np, "trapz", None))
+
+
+def _trapz_pair(y1: np.ndarray, y2: np.ndarray, x: np.ndarray) -> tuple:
+    """Trapezoidal integrals of two series over the same abscissa.
+
+    Both wind components are always integrated over the same height
+    column; computing the layer thicknesses once and reusing them for
+    both integrals halves the setup work of calling _trapz twice.
+    """
+    dx = np.diff(x)
+    i1 = float(np.dot((y1[:-1] + y1[1:]) / 2, dx))
+    i2 = float(np.dot((y2[:-1] + y2[1:]) / 2, dx))
+    return i1, i2
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # THERMODYNAMIC HELPERS
@@ -76,6 +102,40 @@ def theta_e(t_c: float, td_c: float, p_hpa: float) -> float:
            math.exp((3.376 / t_lcl - 0.00254) * w * 1000 * (1 + 0.81e-3 * w * 1000))
 
 
+def theta_e_vec(t_c: np.ndarray, td_c: np.ndarray, p_hpa: np.ndarray) -> np.ndarray:
+    """
+    Vectorized θe (Bolton 1980) over arrays of any shape — e.g. a whole
+    surface grid or all levels of a profile in one pass. Cells where the
+    formula is undefined come back as NaN instead of raising.
+    """
+    tk  = np.asarray(t_c, dtype=float) + T0
+    tdk = np.asarray(td_c, dtype=float) + T0
+    p   = np.asarray(p_hpa, dtype=float)
+    td  = tdk - T0
+    with np.errstate(all="ignore"):
+        e = 6.112 * np.exp(17.67 * td / (td + 243.5))
+        w = eps * e / (p - e)
+        t_lcl = 56 + 1.0 / (1.0 / (tdk - 56) + np.log(tk / tdk) / 800.0)
+        th_e = tk * (1000.0 / p) ** (0.2854 * (1 - 0.28e-3 * w * 1000)) * \
+               np.exp((3.376 / t_lcl - 0.00254) * w * 1000 * (1 + 0.81e-3 * w * 1000))
+    return np.where(np.isfinite(th_e), th_e, np.nan)
+
+
+def dewpoint_from_rh(t_c, rh_pct, out=None):
+    """
+    Dewpoint from temperature and relative humidity via the linear
+    Td ≈ T - (100 - RH)/5 approximation. Accepts scalars or arrays; an
+    optional out= buffer (may alias rh_pct) avoids a fresh allocation
+    on matrix-sized inputs.
+    """
+    if out is not None:
+        np.subtract(rh_pct, 100.0, out=out)
+        out /= 5.0
+        out += t_c
+        return out
+    return t_c - (100.0 - rh_pct) / 5.0
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # LCL CALCULATION
 # ─────────────────────────────────────────────────────────────────────────────
@@ -107,23 +167,76 @@ def _moist_lapse_rate(t_k: float, p_hpa: float) -> float:
     denom = Cp + (Lv**2 * ws * eps) / (Rd * t_k**2)
     return numer / denom
 
+# Constant subexpressions of the moist lapse rate, hoisted so each
+# integration step costs one exp and a handful of multiplies.
+_K_NUM = Lv / Rd
+_K_DEN = Lv * Lv * eps / Rd
+
+
+def _moist_ascent_kernel(p_fine: np.ndarray, t0_k: float) -> np.ndarray:
+    """
+    Euler moist-ascent integration over a descending fine pressure grid.
+
+    Written in nopython-compatible style (plain floats, array writes, no
+    Python objects) so numba can compile it unchanged; keep the physics
+    in sync with the interpreted loop in lift_parcel_moist.
+    """
+    n = p_fine.shape[0]
+    t_parcel = np.empty(n)
+    t = t0_k
+    t_parcel[0] = t
+    for i in range(1, n):
+        p_prev = p_fine[i - 1]
+        dp = p_fine[i] - p_prev          # negative
+        # Convert dp to dz via hydrostatic (the hPa→Pa factors cancel)
+        dz = -Rd * t * dp / (g * p_prev)
+        tc = t - T0
+        e  = 6.112 * math.exp(17.67 * tc / (tc + 243.5))
+        ws = eps * e / (p_prev - e)
+        lapse = (g * (1.0 + _K_NUM * ws / t)) / (Cp + _K_DEN * ws / (t * t))
+        t = t - lapse * dz
+        t_parcel[i] = t
+    return t_parcel
+
+
+if _njit is not None:
+    _moist_ascent_kernel = _njit(cache=True)(_moist_ascent_kernel)
+
+
 def lift_parcel_moist(t0_k: float, p0_hpa: float, p_levels_hpa: np.ndarray) -> np.ndarray:
     """
     Lift a saturated parcel from (t0_k, p0_hpa) to each pressure level.
-    Uses simple Euler integration with 10 hPa steps.
+    Uses simple Euler integration with 5 hPa steps.
     Returns parcel temperature array in K at p_levels_hpa.
     """
     # Interpolate to finer grid for accuracy
     p_fine = np.arange(p0_hpa, p_levels_hpa[-1] - 1, -5.0)
-    t_parcel = np.zeros(len(p_fine))
-    t_parcel[0] = t0_k
 
-    for i in range(1, len(p_fine)):
-        dp = p_fine[i] - p_fine[i - 1]   # negative
-        # Convert dp to dz via hydrostatic
-        dz = -Rd * t_parcel[i-1] / (g * p_fine[i-1] * 100) * (dp * 100)
-        lapse = _moist_lapse_rate(t_parcel[i-1], p_fine[i-1])
-        t_parcel[i] = t_parcel[i-1] - lapse * dz
+    if _njit is not None:
+        t_parcel = _moist_ascent_kernel(p_fine, float(t0_k))
+    else:
+        # This integration is the hottest numeric kernel in the tree (it
+        # runs per 5 hPa step for every parcel of every analyzed hour), so
+        # the saturation mixing ratio and moist lapse rate from
+        # _moist_lapse_rate are inlined here and the state is carried in
+        # plain floats rather than re-reading boxed array elements each
+        # step. Keep the physics in sync with _moist_ascent_kernel.
+        t_parcel = np.zeros(len(p_fine))
+        t_parcel[0] = t0_k
+        p_list = p_fine.tolist()
+        exp = math.exp
+        t = float(t0_k)
+        for i in range(1, len(p_list)):
+            p_prev = p_list[i - 1]
+            dp = p_list[i] - p_prev          # negative
+            # Convert dp to dz via hydrostatic (the hPa→Pa factors cancel)
+            dz = -Rd * t * dp / (g * p_prev)
+            tc = t - T0
+            e  = 6.112 * exp(17.67 * tc / (tc + 243.5))
+            ws = eps * e / (p_prev - e)
+            lapse = (g * (1 + _K_NUM * ws / t)) / (Cp + _K_DEN * ws / (t * t))
+            t = t - lapse * dz
+            t_parcel[i] = t
 
     # Interpolate back to target levels
     result = np.interp(p_levels_hpa, p_fine[::-1], t_parcel[::-1])
@@ -159,10 +272,7 @@ def compute_cape_cin(
 
     # ── Most-unstable parcel ────────────────────────────────────────────────
     mu_mask = p_hpa >= (p_sfc - 300.0)
-    theta_e_vals = np.array([
-        theta_e(float(t_c[i]), float(td_c[i]), float(p_hpa[i]))
-        for i in range(len(p_hpa)) if mu_mask[i]
-    ])
+    theta_e_vals = theta_e_vec(t_c[mu_mask], td_c[mu_mask], p_hpa[mu_mask])
     mu_idx_local = int(np.argmax(theta_e_vals))
     mu_idx = np.where(mu_mask)[0][mu_idx_local]
     t_mu   = float(t_c[mu_idx])
@@ -175,10 +285,11 @@ def compute_cape_cin(
 
     def _cape_cin(parcel_t_c, parcel_td_c, parcel_p, parcel_lcl_p, parcel_lcl_t_c):
         """Integrate CAPE and CIN for a given parcel."""
-        # Levels above parcel origin, sorted top to bottom → bottom to top
+        # Levels above parcel origin; profile is bottom→top (descending
+        # pressure), so the masked slice already integrates upward.
         mask = p_hpa <= parcel_p
-        p_above = p_hpa[mask][::-1]   # ascending pressure (bottom→top)
-        t_above = t_c[mask][::-1]
+        p_above = p_hpa[mask]
+        t_above = t_c[mask]
 
         if len(p_above) < 2:
             return 0.0, 0.0
@@ -197,23 +308,20 @@ def compute_cape_cin(
             moist_temps = lift_parcel_moist(t_lcl_k, parcel_lcl_p, p_above[lcl_mask])
             t_parcel_k[lcl_mask] = moist_temps
 
-        cape = 0.0
-        cin  = 0.0
         env_k = c_to_k(t_above)
 
-        for i in range(len(p_above) - 1):
-            # Layer mean buoyancy
-            b_mean = g * ((t_parcel_k[i] + t_parcel_k[i+1]) / 2 -
-                          (env_k[i] + env_k[i+1]) / 2) / ((env_k[i] + env_k[i+1]) / 2)
-            # dz via hypsometric
-            dz = (Rd * (env_k[i] + env_k[i+1]) / 2) / g * math.log(p_above[i] / p_above[i+1])
-            contribution = b_mean * dz
-            if contribution > 0:
-                cape += contribution
-            else:
-                # CIN only below LFC
-                if cape == 0.0:
-                    cin += contribution
+        # Layer-mean buoyancy and hypsometric thickness for all layers at
+        # once; CAPE is the positive area, CIN the negative area below the
+        # LFC (everything before the first positive layer).
+        env_mean_k = (env_k[:-1] + env_k[1:]) / 2
+        b_mean = g * ((t_parcel_k[:-1] + t_parcel_k[1:]) / 2 - env_mean_k) / env_mean_k
+        dz = (Rd * env_mean_k / g) * np.log(p_above[:-1] / p_above[1:])
+        contribution = b_mean * dz
+
+        positive = contribution > 0
+        cape = float(contribution[positive].sum())
+        lfc_i = int(np.argmax(positive)) if positive.any() else len(contribution)
+        cin = float(contribution[:lfc_i].sum())
 
         return cape, cin
 
@@ -230,6 +338,8 @@ def compute_cape_cin(
         "mu_lcl_hgt": mu_lcl_hgt,
         "ml_lcl_t_c": ml_lcl_t,
         "mu_lcl_t_c": mu_lcl_t,
+        "ml_lcl_p": ml_lcl_p,
+        "mu_lcl_p": mu_lcl_p,
     }
 
 
@@ -239,12 +349,30 @@ def compute_cape_cin(
 
 def dir_spd_to_uv(direction_deg: float, speed_kt: float):
     """Meteorological wind → U/V components (kt)."""
-    rad = math.radians(direction_deg)
+    rad = direction_deg * DEG2RAD
     return -speed_kt * math.sin(rad), -speed_kt * math.cos(rad)
 
+def dir_spd_to_uv_vec(direction_deg: np.ndarray, speed_kt: np.ndarray) -> tuple:
+    """
+    Vectorized meteorological wind → U/V components (kt).
+    Operates on whole arrays (e.g. all levels of a profile, or all hours
+    of a forecast) in a single ufunc pass instead of per-element math calls.
+    The radians array is computed once, shared by the sin/cos passes, and
+    then reused as the cos output buffer so the whole conversion touches
+    only two freshly allocated arrays.
+    """
+    rad = direction_deg * DEG2RAD
+    u = np.sin(rad)
+    u *= speed_kt
+    np.negative(u, out=u)
+    v = np.cos(rad, out=rad)
+    v *= speed_kt
+    np.negative(v, out=v)
+    return u, v
+
 def uv_to_dir_spd(u: float, v: float):
     """U/V → meteorological direction (deg) and speed (kt)."""
-    spd = math.sqrt(u**2 + v**2)
+    spd = math.hypot(u, v)
     dirn = math.degrees(math.atan2(-u, -v)) % 360
     return dirn, spd
 
@@ -264,12 +392,13 @@ def pressure_to_height_msl(p_hpa: np.ndarray, t_c: np.ndarray, p_sfc: float, z_s
     Convert pressure levels to heights MSL using hypsometric equation.
     p_hpa must be sorted descending (sfc → top).
     """
-    heights = np.zeros(len(p_hpa))
+    t_k = np.asarray(t_c, dtype=float) + T0
+    t_mean_k = (t_k[:-1] + t_k[1:]) / 2.0
+    dz = (Rd * t_mean_k / g) * np.log(p_hpa[:-1] / p_hpa[1:])
+    heights = np.empty(len(p_hpa))
     heights[0] = z_sfc
-    for i in range(1, len(p_hpa)):
-        t_mean_k = (c_to_k(float(t_c[i-1])) + c_to_k(float(t_c[i]))) / 2.0
-        dz = (Rd * t_mean_k / g) * math.log(float(p_hpa[i-1]) / float(p_hpa[i]))
-        heights[i] = heights[i-1] + dz
+    np.cumsum(dz, out=heights[1:])
+    heights[1:] += z_sfc
     return heights
 
 
@@ -293,22 +422,26 @@ def bunkers_storm_motion(
 
     Returns dict: rm_u, rm_v, lm_u, lm_v, mean_u, mean_v
     """
-    # Mean wind 0–6 km (pressure-weighted approximation via equal-height integration)
-    mask = heights_m_agl <= top_m
-    if mask.sum() < 2:
+    # Mean wind 0–6 km (pressure-weighted approximation via equal-height
+    # integration). Heights are sorted bottom→top, so the layer is a
+    # contiguous prefix — slice views instead of boolean-mask copies.
+    n = int(np.searchsorted(heights_m_agl, top_m, side="right"))
+    if n < 2:
         return {"rm_u": 0, "rm_v": 0, "lm_u": 0, "lm_v": 0, "mean_u": 0, "mean_v": 0}
 
-    h_layer = heights_m_agl[mask]
-    u_layer = u_kt[mask]
-    v_layer = v_kt[mask]
+    h_layer = heights_m_agl[:n]
+    u_layer = u_kt[:n]
+    v_layer = v_kt[:n]
 
-    mean_u = float(np.trapz(u_layer, h_layer) / (h_layer[-1] - h_layer[0]))
-    mean_v = float(np.trapz(v_layer, h_layer) / (h_layer[-1] - h_layer[0]))
+    depth = h_layer[-1] - h_layer[0]
+    iu, iv = _trapz_pair(u_layer, v_layer, h_layer)
+    mean_u = iu / depth
+    mean_v = iv / depth
 
     # Shear vector: surface to top
     sh_u = float(u_layer[-1] - u_layer[0])
     sh_v = float(v_layer[-1] - v_layer[0])
-    shear_mag = math.sqrt(sh_u**2 + sh_v**2)
+    shear_mag = math.hypot(sh_u, sh_v)
 
     if shear_mag < 0.5:
         return {"rm_u": mean_u + 7.5, "rm_v": mean_v - 7.5,
@@ -350,21 +483,51 @@ def compute_srh(
 
     Positive = cyclonic (right-moving supercell favorable).
     """
-    mask = (heights_m_agl >= layer_bot_m) & (heights_m_agl <= layer_top_m)
-    if mask.sum() < 2:
+    lo = int(np.searchsorted(heights_m_agl, layer_bot_m, side="left"))
+    hi = int(np.searchsorted(heights_m_agl, layer_top_m, side="right"))
+    if hi - lo < 2:
         return 0.0
 
-    h  = heights_m_agl[mask]
-    ru = (u_kt[mask] - storm_u)
-    rv = (v_kt[mask] - storm_v)
+    ru = (u_kt[lo:hi] - storm_u)
+    rv = (v_kt[lo:hi] - storm_v)
 
-    srh = 0.0
-    for i in range(len(h) - 1):
-        srh += ru[i] * rv[i+1] - ru[i+1] * rv[i]
+    srh = np.sum(ru[:-1] * rv[1:] - ru[1:] * rv[:-1])
 
     return float(-srh)   # convention: positive = cyclonic
 
 
+def compute_srh_layers(
+    heights_m_agl: np.ndarray,
+    u_kt: np.ndarray,
+    v_kt: np.ndarray,
+    storm_u: float,
+    storm_v: float,
+    layer_tops_m: tuple = (1000.0, 3000.0)
+) -> dict:
+    """
+    SRH for several layer tops from a single storm-relative wind pass.
+
+    The 0-1 km and 0-3 km integrations share the same segment
+    contributions; computing the storm-relative profile and the per-
+    segment terms once avoids redoing the work for each layer.
+    Returns {layer_top_m: srh}.
+    """
+    ru = u_kt - storm_u
+    rv = v_kt - storm_v
+
+    # Per-segment contributions in one vectorized pass; the running
+    # integral up to each level is then a prefix sum, so each layer's SRH
+    # is a single cumsum lookup.
+    segments = ru[:-1] * rv[1:] - ru[1:] * rv[:-1]
+    cumulative = np.concatenate(([0.0], np.cumsum(segments)))
+
+    result = {}
+    for top in layer_tops_m:
+        n = int(np.searchsorted(heights_m_agl, top, side="right"))
+        result[top] = float(-cumulative[n - 1]) if n >= 2 else 0.0
+    return result
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # BULK SHEAR
 # ─────────────────────────────────────────────────────────────────────────────
@@ -379,7 +542,32 @@ def bulk_shear(
     """Bulk wind difference (kt) between two heights."""
     u_bot, v_bot = interpolate_wind_to_height(heights_m_agl, u_kt, v_kt, bottom_m)
     u_top, v_top = interpolate_wind_to_height(heights_m_agl, u_kt, v_kt, top_m)
-    return math.sqrt((u_top - u_bot)**2 + (v_top - v_bot)**2)
+    return math.hypot(u_top - u_bot, v_top - v_bot)
+
+def bulk_shear_layers(
+    heights_m_agl: np.ndarray,
+    u_kt: np.ndarray,
+    v_kt: np.ndarray,
+    layers: tuple = ((0.0, 1000.0), (0.0, 6000.0), (3000.0, 6000.0)),
+) -> dict:
+    """
+    Bulk wind difference (kt) for several (bottom_m, top_m) layers at once.
+
+    Interpolates each wind component to the distinct layer endpoints with a
+    single np.interp call, then takes the hypotenuse of the endpoint
+    differences — equivalent to calling bulk_shear once per layer but
+    without re-interpolating shared heights (e.g. the surface).
+    Returns {(bottom_m, top_m): shear_kt}.
+    """
+    targets = np.array(sorted({float(z) for bt in layers for z in bt}))
+    u_t = np.interp(targets, heights_m_agl, u_kt)
+    v_t = np.interp(targets, heights_m_agl, v_kt)
+    idx = {z: i for i, z in enumerate(targets.tolist())}
+    return {
+        (bot, top): math.hypot(u_t[idx[float(top)]] - u_t[idx[float(bot)]],
+                               v_t[idx[float(top)]] - v_t[idx[float(bot)]])
+        for bot, top in layers
+    }
 
 def mean_wind(
     heights_m_agl: np.ndarray,
@@ -389,72 +577,85 @@ def mean_wind(
     top_m: float
 ) -> tuple:
     """Layer-mean wind (u, v) in kt via trapezoidal integration."""
-    mask = (heights_m_agl >= bottom_m) & (heights_m_agl <= top_m)
-    if mask.sum() < 2:
+    lo = int(np.searchsorted(heights_m_agl, bottom_m, side="left"))
+    hi = int(np.searchsorted(heights_m_agl, top_m, side="right"))
+    if hi - lo < 2:
         u_b, v_b = interpolate_wind_to_height(heights_m_agl, u_kt, v_kt, bottom_m)
         u_t, v_t = interpolate_wind_to_height(heights_m_agl, u_kt, v_kt, top_m)
         return (u_b + u_t) / 2, (v_b + v_t) / 2
-    h = heights_m_agl[mask]
+    h = heights_m_agl[lo:hi]
     depth = h[-1] - h[0]
     if depth < 1:
-        return float(u_kt[mask][0]), float(v_kt[mask][0])
-    mu = float(np.trapz(u_kt[mask], h) / depth)
-    mv = float(np.trapz(v_kt[mask], h) / depth)
-    return mu, mv
+        return float(u_kt[lo]), float(v_kt[lo])
+    iu, iv = _trapz_pair(u_kt[lo:hi], v_kt[lo:hi], h)
+    return iu / depth, iv / depth
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # COMPOSITE PARAMETERS
 # ─────────────────────────────────────────────────────────────────────────────
 
-def supercell_composite(mucape: float, eff_srh: float, shear_06_kt: float) -> float:
+def supercell_composite(mucape, eff_srh, shear_06_kt):
     """
     SCP (Thompson et al. 2003).
     SCP = (MUCAPE/1000) * (Eff.SRH/50) * (Eff.BWD/20)
     Note: should use effective-layer SRH and shear; 0-3km SRH and 0-6km shear used as proxies.
+    Accepts scalars or equal-shape arrays (e.g. all forecast hours at once).
     """
-    if mucape < 100 or eff_srh <= 0 or shear_06_kt < 10:
-        return 0.0
-    return round((mucape / 1000.0) * (eff_srh / 50.0) * (shear_06_kt / 20.0), 2)
+    mucape      = np.asarray(mucape, dtype=float)
+    eff_srh     = np.asarray(eff_srh, dtype=float)
+    shear_06_kt = np.asarray(shear_06_kt, dtype=float)
+    scp = np.round((mucape / 1000.0) * (eff_srh / 50.0) * (shear_06_kt / 20.0), 2)
+    scp = np.where((mucape < 100) | (eff_srh <= 0) | (shear_06_kt < 10), 0.0, scp)
+    return float(scp) if scp.ndim == 0 else scp
 
 def significant_tornado_parameter(
-    mlcape: float,
-    ml_lcl_hgt: float,
-    srh_01: float,
-    shear_06_kt: float,
-    mlcin: float
-) -> float:
+    mlcape,
+    ml_lcl_hgt,
+    srh_01,
+    shear_06_kt,
+    mlcin
+):
     """
     STP fixed-layer (Thompson et al. 2004).
     STP = (MLCAPE/1500) * (LCL_factor) * (0-1km SRH/150) * (BWD/20) * (CIN_factor)
     LCL factor: 1.0 if LCL < 1000m, linear decrease to 0 at 2000m
     CIN factor: 1.0 if CIN > -50, linear decrease to 0 at -200 J/kg
+    Accepts scalars or equal-shape arrays.
     """
-    if mlcape < 100 or srh_01 <= 0 or shear_06_kt < 12:
-        return 0.0
+    mlcape      = np.asarray(mlcape, dtype=float)
+    ml_lcl_hgt  = np.asarray(ml_lcl_hgt, dtype=float)
+    srh_01      = np.asarray(srh_01, dtype=float)
+    shear_06_kt = np.asarray(shear_06_kt, dtype=float)
+    mlcin       = np.asarray(mlcin, dtype=float)
 
-    lcl_factor = max(0.0, min(1.0, (2000.0 - ml_lcl_hgt) / 1000.0))
-    cin_factor  = max(0.0, min(1.0, (mlcin + 200.0) / 150.0))   # mlcin is negative
-    stp = (mlcape / 1500.0) * lcl_factor * (srh_01 / 150.0) * (shear_06_kt / 20.0) * cin_factor
-    return round(stp, 2)
+    lcl_factor = np.clip((2000.0 - ml_lcl_hgt) / 1000.0, 0.0, 1.0)
+    cin_factor = np.clip((mlcin + 200.0) / 150.0, 0.0, 1.0)   # mlcin is negative
+    stp = np.round((mlcape / 1500.0) * lcl_factor * (srh_01 / 150.0)
+                   * (shear_06_kt / 20.0) * cin_factor, 2)
+    stp = np.where((mlcape < 100) | (srh_01 <= 0) | (shear_06_kt < 12), 0.0, stp)
+    return float(stp) if stp.ndim == 0 else stp
 
-def energy_helicity_index(cape: float, srh: float) -> float:
+def energy_helicity_index(cape, srh):
     """
     EHI (Davies & Johns 1993).
     EHI = (CAPE * SRH) / 160000
     EHI ≥ 1 supports supercells; ≥ 2–2.5 significant tornadoes.
+    Accepts scalars or equal-shape arrays.
     """
-    if cape < 100 or srh <= 0:
-        return 0.0
-    return round((cape * srh) / 160000.0, 2)
+    cape = np.asarray(cape, dtype=float)
+    srh  = np.asarray(srh, dtype=float)
+    ehi = np.round((cape * srh) / 160000.0, 2)
+    ehi = np.where((cape < 100) | (srh <= 0), 0.0, ehi)
+    return float(ehi) if ehi.ndim == 0 else ehi
 
 def significant_hail_parameter(
-    mucape: float,
-    mu_lcl_t_c: float,
-    mid_lapse: float,
-    precipitable_water: float,
-    shear_06_kt: float
-) -> float:
+    mucape,
+    mu_lcl_t_c,
+    mid_lapse,
+    precipitable_water,
+    shear_06_kt
+):
     """
     SHIP (SPC operational definition).
     SHIP = (MUCAPE/1000) * (mu_lcl_t / -10) * (lapse_500_700 / 5.5) * (PW / 13.6) * (shear_06 / 27)
@@ -462,41 +663,50 @@ def significant_hail_parameter(
     mu_lcl_t_c: parcel temperature at LCL in C (should be negative = glaciation level proxy)
     mid_lapse: 500-700 hPa lapse rate in C/km
     precipitable_water: mm
+    Accepts scalars or equal-shape arrays.
     """
-    if mucape < 100:
-        return 0.0
+    mucape      = np.asarray(mucape, dtype=float)
+    mu_lcl_t_c  = np.asarray(mu_lcl_t_c, dtype=float)
+    mid_lapse   = np.asarray(mid_lapse, dtype=float)
+    pw          = np.asarray(precipitable_water, dtype=float)
+    shear_06_kt = np.asarray(shear_06_kt, dtype=float)
+
     # Clamp terms per SPC convention
-    lcl_t_term = max(0.0, -mu_lcl_t_c / 10.0)   # positive when LCL is cold
-    lapse_term  = max(0.0, mid_lapse / 5.5)
-    pw_term     = max(0.0, min(1.5, precipitable_water / 13.6))
-    shear_term  = min(1.5, shear_06_kt / 27.0)
-    ship = (mucape / 1000.0) * lcl_t_term * lapse_term * pw_term * shear_term
-    return round(ship, 2)
+    lcl_t_term = np.maximum(0.0, -mu_lcl_t_c / 10.0)   # positive when LCL is cold
+    lapse_term = np.maximum(0.0, mid_lapse / 5.5)
+    pw_term    = np.clip(pw / 13.6, 0.0, 1.5)
+    shear_term = np.minimum(1.5, shear_06_kt / 27.0)
+    ship = np.round((mucape / 1000.0) * lcl_t_term * lapse_term * pw_term * shear_term, 2)
+    ship = np.where(mucape < 100, 0.0, ship)
+    return float(ship) if ship.ndim == 0 else ship
 
 def vorticity_generation_parameter(
-    srh_01: float,
-    shear_01_kt: float
-) -> float:
+    srh_01,
+    shear_01_kt
+):
     """
     VGP (Rasmussen & Blanchard 1998 / Markowski et al.).
     VGP = sqrt(SREH * BWD_01) / 1000
     Higher values → enhanced low-level vorticity generation, favorable for tornadogenesis.
     VGP ≥ 0.2 supports tornadoes.
+    Accepts scalars or equal-shape arrays.
     """
-    if srh_01 <= 0 or shear_01_kt <= 0:
-        return 0.0
-    return round(math.sqrt(max(0, srh_01) * shear_01_kt) / 1000.0, 3)
+    srh_01      = np.asarray(srh_01, dtype=float)
+    shear_01_kt = np.asarray(shear_01_kt, dtype=float)
+    vgp = np.round(np.sqrt(np.maximum(0.0, srh_01) * np.maximum(0.0, shear_01_kt)) / 1000.0, 3)
+    vgp = np.where((srh_01 <= 0) | (shear_01_kt <= 0), 0.0, vgp)
+    return float(vgp) if vgp.ndim == 0 else vgp
 
-def craven_brooks(mlcape: float, shear_06_kt: float) -> float:
+def craven_brooks(mlcape, shear_06_kt):
     """
     Craven-Brooks (2004) Significant Severe Threshold.
     CB = MLCAPE * BWD_06 / 1e6  (J/kg * m/s product)
     Convert shear from kt to m/s: 1 kt = 0.514 m/s
     Threshold > 20,000 J/kg·m/s (or in normalized form > 0.02) supports sig. severe.
+    Accepts scalars or equal-shape arrays.
     """
-    shear_ms = shear_06_kt * 0.514
-    cb = mlcape * shear_ms
-    return round(cb, 0)  # in J/kg·m/s, threshold ~20000
+    cb = np.round(np.asarray(mlcape, dtype=float) * (np.asarray(shear_06_kt, dtype=float) * 0.514), 0)
+    return float(cb) if cb.ndim == 0 else cb   # in J/kg·m/s, threshold ~20000
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -520,16 +730,38 @@ def lapse_rate(
         return 0.0
     return round((t_bot - t_top) / depth_km, 2)
 
+def lapse_rate_layers(
+    heights_m: np.ndarray,
+    t_c: np.ndarray,
+    layers: tuple = ((0.0, 3000.0), (3000.0, 5500.0)),
+) -> dict:
+    """
+    Lapse rate (C/km) for several (bot_m, top_m) layers from one
+    temperature interpolation over the distinct endpoints — the same
+    batching pattern as bulk_shear_layers. Returns {(bot, top): C/km}.
+    """
+    targets = np.array(sorted({float(z) for bt in layers for z in bt}))
+    t_t = np.interp(targets, heights_m, t_c)
+    idx = {z: i for i, z in enumerate(targets.tolist())}
+    result = {}
+    for bot, top in layers:
+        depth_km = (top - bot) / 1000.0
+        if depth_km < 0.1:
+            result[(bot, top)] = 0.0
+        else:
+            result[(bot, top)] = round(
+                float(t_t[idx[float(bot)]] - t_t[idx[float(top)]]) / depth_km, 2)
+    return result
+
 def precipitable_water(p_hpa: np.ndarray, td_c: np.ndarray) -> float:
     """
     Precipitable water in mm (integrate water vapor through column).
+    Trapezoidal integration as a single NumPy reduction.
     """
-    pw = 0.0
-    for i in range(len(p_hpa) - 1):
-        w1 = mixing_ratio_from_dewpoint(float(td_c[i]),   float(p_hpa[i]))
-        w2 = mixing_ratio_from_dewpoint(float(td_c[i+1]), float(p_hpa[i+1]))
-        dp = abs(float(p_hpa[i]) - float(p_hpa[i+1])) * 100  # Pa
-        pw += (w1 + w2) / 2 * dp / g
+    e = 6.112 * np.exp(17.67 * td_c / (td_c + 243.5))   # Bolton, elementwise
+    w = eps * e / (p_hpa - e)                            # mixing ratio kg/kg
+    dp = np.abs(np.diff(p_hpa)) * 100.0                  # Pa
+    pw = float(np.sum((w[:-1] + w[1:]) / 2.0 * dp / g))
     return round(pw * 1000, 1)   # kg/m² = mm
 
 
@@ -626,23 +858,14 @@ def detect_boundaries(
         return result
 
     try:
-        # Compute θe on grid
-        theta_e_grid = np.zeros_like(grid_t_sfc)
-        for i in range(grid_t_sfc.shape[0]):
-            for j in range(grid_t_sfc.shape[1]):
-                try:
-                    theta_e_grid[i, j] = theta_e(
-                        float(grid_t_sfc[i, j]),
-                        float(grid_td_sfc[i, j]),
-                        float(grid_p_sfc[i, j])
-                    )
-                except Exception:
-                    theta_e_grid[i, j] = np.nan
+        # Compute θe on the whole grid in one vectorized pass; undefined
+        # cells come back as NaN just as the per-cell loop produced.
+        theta_e_grid = theta_e_vec(grid_t_sfc, grid_td_sfc, grid_p_sfc)
 
         # Gradient magnitude (simple finite difference)
         dy = np.gradient(theta_e_grid, axis=0)  # K per grid-step latitude
         dx = np.gradient(theta_e_grid, axis=1)
-        grad_mag = np.sqrt(dy**2 + dx**2)  # K per grid step
+        grad_mag = np.hypot(dy, dx)  # K per grid step
 
         # Convert to K/100km (rough: 1 deg lat ≈ 111 km)
         lat_spacing_deg = float(np.abs(np.diff(grid_lat[:, 0]).mean())) if grid_lat.shape[0] > 1 else 1.0
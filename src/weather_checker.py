@@ -5,14 +5,19 @@ Model chain: HRRR → NAM-3km → GFS → Open-Meteo
 """
 
 import asyncio
+import bisect
 import math
 import logging
+import operator
+import time
 from datetime import datetime
 
-from nicegui import ui, run
+import numpy as np
+import pandas as pd
+from nicegui import app, ui, run
 
-from data_fetcher import fetch_profiles, geocode
-from analysis_engine import analyze_profile, EnvironmentAnalysis
+from data_fetcher import fetch_profiles, geocode, get_spc_outlook, parse_latlon
+from analysis_engine import analyze_profiles, EnvironmentAnalysis, SUPPORT_LEVELS
 
 logging.basicConfig(level=logging.INFO)
 
@@ -20,45 +25,41 @@ logging.basicConfig(level=logging.INFO)
 # SUPPORT LEVEL COLOR MAPS
 # ─────────────────────────────────────────────────────────────────────────────
 
-TEXT_COLOR = {
-    "grey":   "text-gray-400",
-    "blue":   "text-blue-400",
-    "green":  "text-green-400",
-    "yellow": "text-yellow-300",
-    "orange": "text-orange-400",
-    "red":    "text-red-400",
+# One table of (text_class, badge_color) per support color — a single
+# lookup per card instead of probing two parallel dicts.
+CARD_COLORS = {
+    "grey":   ("text-gray-400",   "grey-7"),
+    "blue":   ("text-blue-400",   "blue"),
+    "green":  ("text-green-400",  "green"),
+    "yellow": ("text-yellow-300", "yellow-8"),
+    "orange": ("text-orange-400", "orange"),
+    "red":    ("text-red-400",    "red"),
 }
 
-BADGE_COLOR = {
-    "grey":   "grey-7",
-    "blue":   "blue",
-    "green":  "green",
-    "yellow": "yellow-8",
-    "orange": "orange",
-    "red":    "red",
-}
+
+def fmt_valid_time(vt, fmt: str) -> str:
+    """Format a profile valid time, tolerating plain-string timestamps."""
+    return vt.strftime(fmt) if hasattr(vt, "strftime") else str(vt)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # PARAMETER THRESHOLD TABLE — for inline flag rendering
 # ─────────────────────────────────────────────────────────────────────────────
 
-def flag(val, thresholds: list) -> str:
+# The ladders are sorted ascending, so the highest exceeded rung is a
+# binary search rather than a walk over every tuple per rendered row.
+_threshold_key = operator.itemgetter(0)
+
+
+def flag_and_color(val, thresholds: list) -> tuple:
     """
     thresholds: list of (value, label, color_class) tuples in ascending order.
-    Returns the label for the highest exceeded threshold.
+    Returns (label, color_class) for the highest exceeded threshold — one
+    lookup instead of twin flag/color functions bisecting the same ladder.
     """
-    label = ""
-    for thresh, lbl, _ in thresholds:
-        if val >= thresh:
-            label = lbl
-    return label
-
-def param_color(val, thresholds: list) -> str:
-    color = "text-gray-300"
-    for thresh, _, cls in thresholds:
-        if val >= thresh:
-            color = cls
-    return color
+    i = bisect.bisect_right(thresholds, val, key=_threshold_key)
+    if i:
+        return thresholds[i - 1][1], thresholds[i - 1][2]
+    return "", "text-gray-300"
 
 
 CAPE_THRESH  = [(500, "", ""), (1000, "⚡", "text-yellow-300"), (2500, "⚡⚡", "text-orange-400"), (4000, "⚡⚡⚡", "text-red-400")]
@@ -74,30 +75,46 @@ SHIP_THRESH  = [(0.5, "⚠", "text-yellow-300"), (1, "⚠⚠", "text-orange-400"
 # CARD RENDERING
 # ─────────────────────────────────────────────────────────────────────────────
 
-def render_param_row(label: str, value: str, thresholds=None, raw_val: float = None):
-    """Render a single parameter row with optional color/flag."""
+def param_cell_html(label: str, value: str, thresholds=None, raw_val: float = None) -> str:
+    """One parameter row as an HTML fragment with optional color/flag."""
     color = "text-gray-200"
     flag_str = ""
     if thresholds and raw_val is not None:
-        color    = param_color(raw_val, thresholds)
-        flag_str = flag(raw_val, thresholds)
+        flag_str, color = flag_and_color(raw_val, thresholds)
+
+    flag_html = f'<span class="text-xs mr-1">{flag_str}</span>' if flag_str else ""
+    return (
+        '<div class="flex justify-between items-center py-0">'
+        f'<span class="text-xs text-gray-400">{label}</span>'
+        f'<span>{flag_html}<span class="text-sm font-mono {color}">{value}</span></span>'
+        "</div>"
+    )
+
 
-    with ui.row().classes("w-full justify-between items-center py-0"):
-        ui.label(label).classes("text-xs text-gray-400")
-        with ui.row().classes("items-center gap-1"):
-            if flag_str:
-                ui.label(flag_str).classes("text-xs")
-            ui.label(value).classes(f"text-sm font-mono {color}")
+def section_html(title: str) -> str:
+    return (
+        '<div class="col-span-2 text-xs font-bold text-gray-400 uppercase '
+        f'tracking-wider mt-3 mb-1 border-b border-gray-700 pb-1">{title}</div>'
+    )
 
 
 def render_section(title: str):
     ui.label(title).classes("text-xs font-bold text-gray-400 uppercase tracking-wider mt-3 mb-1 border-b border-gray-700 pb-1")
 
 
-def render_analysis_card(a: EnvironmentAnalysis):
-    dt_str = a.valid_time.strftime("%-I %p %a") if hasattr(a.valid_time, 'strftime') else str(a.valid_time)
-    tc = TEXT_COLOR.get(a.support_color, "text-white")
-    bc = BADGE_COLOR.get(a.support_color, "grey")
+def render_text_section(title: str, lines: list, color: str):
+    """Section header plus one joined bullet-list label (single widget)."""
+    if not lines:
+        return
+    render_section(title)
+    ui.label("\n".join(f"• {line}" for line in lines)).classes(
+        f"text-sm {color} whitespace-pre-line")
+
+
+def render_analysis_card(a: EnvironmentAnalysis, show_notes: bool = True, dt_str: str = None):
+    if dt_str is None:
+        dt_str = fmt_valid_time(a.valid_time, "%-I %p %a")
+    tc, bc = CARD_COLORS.get(a.support_color, ("text-white", "grey"))
 
     with ui.card().classes("w-full bg-gray-900 border border-gray-700"):
         with ui.expansion() as exp:
@@ -110,236 +127,355 @@ def render_analysis_card(a: EnvironmentAnalysis):
                         ui.label(f"MLCAPE {a.mlcape:.0f}  ·  SCP {a.scp:.1f}  ·  STP {a.stp:.2f}  ·  SHR6 {a.shear_06_kt:.0f}kt").classes("text-xs text-gray-400")
                     ui.badge(a.support_label, color=bc).props("rounded")
 
-            # ── Expanded detail ──────────────────────────────────────────
-            with ui.column().classes("w-full gap-0 px-2 pb-3"):
-
-                # Instability
-                render_section("🌡  Instability")
-                with ui.grid(columns=2).classes("w-full gap-x-8"):
-                    render_param_row("MLCAPE",      f"{a.mlcape:.0f} J/kg",    CAPE_THRESH, a.mlcape)
-                    render_param_row("MUCAPE",      f"{a.mucape:.0f} J/kg",    CAPE_THRESH, a.mucape)
-                    render_param_row("MLCIN",       f"{a.mlcin:.0f} J/kg")
-                    render_param_row("Lifted Index", f"{a.li:.1f} K")
-                    render_param_row("ML LCL",      f"{a.ml_lcl_hgt:.0f} m")
-                    render_param_row("MU LCL",      f"{a.mu_lcl_hgt:.0f} m")
-
-                # Lapse Rates / Moisture
-                render_section("🌧  Thermo / Moisture")
-                with ui.grid(columns=2).classes("w-full gap-x-8"):
-                    render_param_row("700–500 Lapse",  f"{a.lapse_700_500:.1f} C/km")
-                    render_param_row("Sfc–700 Lapse",  f"{a.lapse_sfc_700:.1f} C/km")
-                    render_param_row("Precip. Water",   f"{a.pw_mm:.0f} mm")
-                    render_param_row("Sfc RH",          f"{a.rh_sfc:.0f}%")
-
-                # Kinematics
-                render_section("💨  Kinematics")
-                with ui.grid(columns=2).classes("w-full gap-x-8"):
-                    render_param_row("0–1km Shear",  f"{a.shear_01_kt:.0f} kt")
-                    render_param_row("0–6km Shear",  f"{a.shear_06_kt:.0f} kt",  SHR6_THRESH, a.shear_06_kt)
-                    render_param_row("3–6km Shear",  f"{a.shear_36_kt:.0f} kt")
-                    render_param_row("0–1km SRH",    f"{a.srh_01:.0f} m²/s²",   SRH_THRESH, max(a.srh_01, 0))
-                    render_param_row("0–3km SRH",    f"{a.srh_03:.0f} m²/s²",   SRH_THRESH, max(a.srh_03, 0))
-                    render_param_row("Eff. SRH",     f"{a.srh_eff:.0f} m²/s²")
-                    render_param_row("Storm Motion", f"{a.storm_dir_deg:.0f}° @ {a.storm_speed_kt:.0f} kt")
-                    render_param_row("",             "")
-
-                # Composite Parameters
-                render_section("📊  Composite Parameters")
-                with ui.grid(columns=2).classes("w-full gap-x-8"):
-                    render_param_row("SCP",         f"{a.scp:.2f}",            SCP_THRESH, a.scp)
-                    render_param_row("STP (fixed)",  f"{a.stp:.2f}",            STP_THRESH, a.stp)
-                    render_param_row("EHI (0-1km)", f"{a.ehi_01:.2f}",         EHI_THRESH, a.ehi_01)
-                    render_param_row("EHI (0-3km)", f"{a.ehi_03:.2f}",         EHI_THRESH, a.ehi_03)
-                    render_param_row("SHIP",        f"{a.ship:.2f}",           SHIP_THRESH, a.ship)
-                    render_param_row("VGP",         f"{a.vgp:.3f}")
-                    render_param_row("Craven-Brooks", f"{a.craven:,.0f} J/kg·m/s")
-                    render_param_row("", "")
-
-                # Boundary
-                if a.boundary.get("boundary_detected") or a.boundary.get("max_gradient_k_per_100km", 0) > 0:
-                    render_section("🗺  Mesoscale Boundaries")
-                    btype = a.boundary.get("boundary_type", "None")
-                    grad  = a.boundary.get("max_gradient_k_per_100km", 0.0)
-                    detected = a.boundary.get("boundary_detected", False)
-                    bcolor = "text-orange-400" if detected else "text-gray-300"
-                    ui.label(f"{'⚠ ' if detected else ''}{btype}  ·  θe gradient {grad:.1f} K/100km").classes(f"text-sm {bcolor}")
-                    for bn in a.boundary.get("notes", []):
-                        ui.label(f"ℹ {bn}").classes("text-xs text-blue-300 mt-1")
-
-                # Warnings
-                if a.warnings:
-                    render_section("🚨  Operational Flags")
-                    for w in a.warnings:
-                        ui.label(f"• {w}").classes("text-sm text-red-400")
-
-                # Fail modes
-                if a.fail_modes:
-                    render_section("⚠  Possible Fail Modes")
-                    for fm in a.fail_modes:
-                        ui.label(f"• {fm}").classes("text-sm text-orange-300")
-
-                # Notes
-                if a.notes:
-                    render_section("ℹ  Analyst Notes")
-                    for n in a.notes:
-                        ui.label(f"• {n}").classes("text-sm text-blue-300")
-
-                # Source
-                ui.label(f"Source: {a.source}").classes("text-xs text-gray-600 mt-3")
-
-
-# ─────────────────────────────────────────────────────────────────────────────
-# MAIN UI
-# ─────────────────────────────────────────────────────────────────────────────
-
-ui.dark_mode().enable()
-ui.add_head_html('<style>body { background: #0f172a; }</style>')
-
-# ── Header ───────────────────────────────────────────────────────────────────
-with ui.row().classes("w-full justify-center items-center pt-8 pb-1 gap-3"):
-    ui.icon("thunderstorm", size="2.5rem").classes("text-yellow-400")
-    ui.label("Severe Weather Environment Diagnostics").classes("text-3xl font-bold text-white")
-
-ui.label(
-    "Ingredient-based convective analysis · HRRR / NAM / GFS / Open-Meteo · Not an official forecast"
-).classes("w-full text-center text-xs text-gray-500 pb-6")
-
-# ── Controls ─────────────────────────────────────────────────────────────────
-with ui.card().classes("w-full max-w-3xl mx-auto mb-2 bg-gray-900 border border-gray-700"):
-    with ui.row().classes("w-full items-end gap-3"):
-        location_input = ui.input(
-            label="Location",
-            placeholder='City name  or  lat, lon  (e.g. "Norman, OK" or "35.22, -97.44")'
-        ).classes("flex-1 text-white")
-        analyze_btn = ui.button("Analyze", icon="search").props("elevated color=yellow")
-
-    with ui.row().classes("w-full items-center gap-6 pt-2 flex-wrap"):
-        hours_select = ui.select(
-            label="Forecast window",
-            options={"24": "24 hours", "48": "48 hours"},
-            value="48"
-        ).classes("w-36")
-
-        min_score_select = ui.select(
-            label="Min. support level",
-            options={"0": "Show all", "1": "Marginal+", "2": "Limited+", "3": "Moderate+"},
-            value="1"
-        ).classes("w-40")
-
-        show_notes_toggle = ui.switch("Show analyst notes", value=True)
-
-status_bar = ui.label("").classes("w-full max-w-3xl mx-auto text-xs text-gray-400 px-1 mb-1")
-
-# ── Legend ────────────────────────────────────────────────────────────────────
-with ui.card().classes("w-full max-w-3xl mx-auto mb-4 bg-gray-900 border border-gray-700 p-3"):
-    ui.label("Support Scale").classes("text-xs font-semibold text-gray-500 mb-2")
-    with ui.row().classes("gap-4 flex-wrap items-center"):
-        for _, lbl, _, emoji in [
-            (0,"None","grey","⬛"), (1,"Marginal","blue","🟦"),
-            (2,"Limited","green","🟩"), (3,"Moderate","yellow","🟨"),
-            (4,"Enhanced","orange","🟧"), (5,"Extreme","red","🟥"),
-        ]:
-            ui.label(f"{emoji} {lbl}").classes("text-xs text-gray-300")
-    ui.label("").classes("mb-1")
-    ui.label("Composite thresholds: SCP ≥ 1 supercell · SCP ≥ 4 significant · STP ≥ 1 tornado · SHIP ≥ 1 sig. hail · EHI(01) ≥ 1 tornado · Craven > 20,000 sig. severe").classes(
-        "text-xs text-gray-600"
-    )
-
-results_col = ui.column().classes("w-full max-w-3xl mx-auto p-1 gap-3 pb-16")
+            # ── Expanded detail — built lazily on first open ─────────────
+            # Cards start collapsed, so materializing every body up front
+            # costs widgets nobody may ever look at; the initial render
+            # pays only for the headers.
+            body = ui.column().classes("w-full gap-0 px-2 pb-3")
+
+            def _populate():
+                if getattr(exp, "_populated", False):
+                    return
+                exp._populated = True
+                with body:
+                    _render_card_body(a, show_notes)
+
+            exp.on_value_change(lambda e: _populate() if e.value else None)
+
+
+def _render_card_body(a: EnvironmentAnalysis, show_notes: bool):
+    # Parameter grid — one HTML string mounted as a single
+    # element instead of ~40 label widgets per card, so a full
+    # 48-hour render sends a handful of DOM patches, not
+    # thousands.
+    cells = [
+        section_html("🌡  Instability"),
+        param_cell_html("MLCAPE",      f"{a.mlcape:.0f} J/kg",    CAPE_THRESH, a.mlcape),
+        param_cell_html("MUCAPE",      f"{a.mucape:.0f} J/kg",    CAPE_THRESH, a.mucape),
+        param_cell_html("MLCIN",       f"{a.mlcin:.0f} J/kg"),
+        param_cell_html("Lifted Index", f"{a.li:.1f} K"),
+        param_cell_html("ML LCL",      f"{a.ml_lcl_hgt:.0f} m"),
+        param_cell_html("MU LCL",      f"{a.mu_lcl_hgt:.0f} m"),
+
+        section_html("🌧  Thermo / Moisture"),
+        param_cell_html("700–500 Lapse",  f"{a.lapse_700_500:.1f} C/km"),
+        param_cell_html("Sfc–700 Lapse",  f"{a.lapse_sfc_700:.1f} C/km"),
+        param_cell_html("Precip. Water",   f"{a.pw_mm:.0f} mm"),
+        param_cell_html("Sfc RH",          f"{a.rh_sfc:.0f}%"),
+
+        section_html("💨  Kinematics"),
+        param_cell_html("0–1km Shear",  f"{a.shear_01_kt:.0f} kt"),
+        param_cell_html("0–6km Shear",  f"{a.shear_06_kt:.0f} kt",  SHR6_THRESH, a.shear_06_kt),
+        param_cell_html("3–6km Shear",  f"{a.shear_36_kt:.0f} kt"),
+        param_cell_html("0–1km SRH",    f"{a.srh_01:.0f} m²/s²",   SRH_THRESH, max(a.srh_01, 0)),
+        param_cell_html("0–3km SRH",    f"{a.srh_03:.0f} m²/s²",   SRH_THRESH, max(a.srh_03, 0)),
+        param_cell_html("Eff. SRH",     f"{a.srh_eff:.0f} m²/s²"),
+        param_cell_html("Storm Motion", f"{a.storm_dir_deg:.0f}° @ {a.storm_speed_kt:.0f} kt"),
+
+        section_html("📊  Composite Parameters"),
+        param_cell_html("SCP",         f"{a.scp:.2f}",            SCP_THRESH, a.scp),
+        param_cell_html("STP (fixed)",  f"{a.stp:.2f}",            STP_THRESH, a.stp),
+        param_cell_html("EHI (0-1km)", f"{a.ehi_01:.2f}",         EHI_THRESH, a.ehi_01),
+        param_cell_html("EHI (0-3km)", f"{a.ehi_03:.2f}",         EHI_THRESH, a.ehi_03),
+        param_cell_html("SHIP",        f"{a.ship:.2f}",           SHIP_THRESH, a.ship),
+        param_cell_html("VGP",         f"{a.vgp:.3f}"),
+        param_cell_html("Craven-Brooks", f"{a.craven:,.0f} J/kg·m/s"),
+    ]
+    ui.html('<div class="grid grid-cols-2 gap-x-8 w-full">'
+            + "".join(cells) + "</div>")
+
+    # Boundary — bind the dict once instead of re-probing it
+    # for every field.
+    boundary = a.boundary
+    detected = boundary.get("boundary_detected", False)
+    grad     = boundary.get("max_gradient_k_per_100km", 0.0)
+    if detected or grad > 0:
+        render_section("🗺  Mesoscale Boundaries")
+        btype = boundary.get("boundary_type", "None")
+        bcolor = "text-orange-400" if detected else "text-gray-300"
+        ui.label(f"{'⚠ ' if detected else ''}{btype}  ·  θe gradient {grad:.1f} K/100km").classes(f"text-sm {bcolor}")
+        bnotes = boundary.get("notes", [])
+        if bnotes:
+            ui.label("\n".join(f"ℹ {bn}" for bn in bnotes)).classes(
+                "text-xs text-blue-300 mt-1 whitespace-pre-line")
+
+    render_text_section("🚨  Operational Flags", a.warnings, "text-red-400")
+    render_text_section("⚠  Possible Fail Modes", a.fail_modes, "text-orange-300")
+    if show_notes:
+        render_text_section("ℹ  Analyst Notes", a.notes, "text-blue-300")
+
+    # Source
+    ui.label(f"Source: {a.source}").classes("text-xs text-gray-600 mt-3")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # ANALYSIS LOGIC
 # ─────────────────────────────────────────────────────────────────────────────
 
-async def run_analysis():
-    raw = location_input.value.strip()
-    if not raw:
-        status_bar.set_text("⚠ Enter a location.")
+# Debounce window: the input is wired to both the button and keydown.enter,
+# so a held/double-tapped Enter would fire several analyses back to back.
+DEBOUNCE_S = 0.3
+_last_trigger = 0.0
+# In-flight guard: a second trigger while a fetch/analysis is still running
+# is dropped instead of racing it for the DOM and the network.
+_running = False
+
+# Results of the most recent run, kept for CSV export.
+_last_analyses = []
+_last_location = ""
+
+# Scalar columns exported to CSV, in spreadsheet order.
+CSV_COLUMNS = [
+    "mlcape", "mucape", "mlcin", "li", "ml_lcl_hgt",
+    "lapse_700_500", "lapse_sfc_700", "pw_mm", "rh_sfc",
+    "shear_01_kt", "shear_06_kt", "shear_36_kt",
+    "srh_01", "srh_03", "srh_eff", "storm_dir_deg", "storm_speed_kt",
+    "scp", "stp", "ehi_01", "ehi_03", "ship", "vgp", "craven",
+    "support_score", "support_label", "convective_mode", "source",
+]
+
+
+def export_csv():
+    """Download the last analysis run as CSV (pandas writes via its C path)."""
+    if not _last_analyses:
+        ui.notify("Run an analysis first.", type="info")
         return
+    # Columnar construction: one list per column instead of a string-keyed
+    # dict per row — pandas ingests columns directly, so no row dicts are
+    # ever materialized.
+    columns = {"valid_time": [fmt_valid_time(a.valid_time, "%Y-%m-%d %H:%M")
+                              for a in _last_analyses]}
+    for col in CSV_COLUMNS:
+        columns[col] = [getattr(a, col) for a in _last_analyses]
+    csv_bytes = pd.DataFrame(columns).to_csv(index=False).encode("utf-8")
+    safe_loc = "".join(c if c.isalnum() else "_" for c in _last_location) or "analysis"
+    ui.download(csv_bytes, f"severe_wx_{safe_loc}.csv")
 
-    results_col.clear()
-    analyze_btn.props("loading")
-    status_bar.set_text("Starting analysis…")
-    await asyncio.sleep(0.05)
 
-    lat, lon, display_name = None, None, raw
+# ─────────────────────────────────────────────────────────────────────────────
+# MAIN UI
+# ─────────────────────────────────────────────────────────────────────────────
 
-    # Parse raw lat,lon
-    try:
-        parts = [p.strip() for p in raw.split(",")]
-        if len(parts) == 2:
-            lat_try = float(parts[0])
-            lon_try = float(parts[1])
-            if -90 <= lat_try <= 90 and -180 <= lon_try <= 180:
-                lat, lon = lat_try, lon_try
-                display_name = f"{lat:.3f}, {lon:.3f}"
-    except ValueError:
-        pass
-
-    if lat is None:
-        status_bar.set_text("Geocoding…")
-        await asyncio.sleep(0.05)
-        geo = geocode(raw)
-        if geo is None:
-            status_bar.set_text("❌ Could not find location. Try 'lat, lon' format.")
-            analyze_btn.props(remove="loading")
+@ui.page("/")
+def index():
+    """Per-client page build; module import no longer touches the UI."""
+    ui.dark_mode().enable()
+    ui.add_head_html('<style>body { background: #0f172a; }</style>')
+
+    # ── Header ───────────────────────────────────────────────────────────────────
+    with ui.row().classes("w-full justify-center items-center pt-8 pb-1 gap-3"):
+        ui.icon("thunderstorm", size="2.5rem").classes("text-yellow-400")
+        ui.label("Severe Weather Environment Diagnostics").classes("text-3xl font-bold text-white")
+
+    ui.label(
+        "Ingredient-based convective analysis · HRRR / NAM / GFS / Open-Meteo · Not an official forecast"
+    ).classes("w-full text-center text-xs text-gray-500 pb-6")
+
+    # ── Controls ─────────────────────────────────────────────────────────────────
+    with ui.card().classes("w-full max-w-3xl mx-auto mb-2 bg-gray-900 border border-gray-700"):
+        with ui.row().classes("w-full items-end gap-3"):
+            location_input = ui.input(
+                label="Location",
+                placeholder='City name  or  lat, lon  (e.g. "Norman, OK" or "35.22, -97.44")'
+            ).classes("flex-1 text-white")
+            analyze_btn = ui.button("Analyze", icon="search").props("elevated color=yellow")
+            export_btn  = ui.button("CSV", icon="download").props("outline color=grey")
+            export_btn.disable()
+
+        with ui.row().classes("w-full items-center gap-6 pt-2 flex-wrap"):
+            hours_select = ui.select(
+                label="Forecast window",
+                options={"24": "24 hours", "48": "48 hours"},
+                value="48"
+            ).classes("w-36")
+
+            min_score_select = ui.select(
+                label="Min. support level",
+                options={"0": "Show all", "1": "Marginal+", "2": "Limited+", "3": "Moderate+"},
+                value="1"
+            ).classes("w-40")
+
+            show_notes_toggle = ui.switch("Show analyst notes", value=True)
+
+    status_bar = ui.label("").classes("w-full max-w-3xl mx-auto text-xs text-gray-400 px-1 mb-1")
+
+    # ── Legend ────────────────────────────────────────────────────────────────────
+    with ui.card().classes("w-full max-w-3xl mx-auto mb-4 bg-gray-900 border border-gray-700 p-3"):
+        ui.label("Support Scale").classes("text-xs font-semibold text-gray-500 mb-2")
+        with ui.row().classes("gap-4 flex-wrap items-center"):
+            for _, lbl, _, emoji in SUPPORT_LEVELS:
+                ui.label(f"{emoji} {lbl}").classes("text-xs text-gray-300")
+        ui.label("").classes("mb-1")
+        ui.label("Composite thresholds: SCP ≥ 1 supercell · SCP ≥ 4 significant · STP ≥ 1 tornado · SHIP ≥ 1 sig. hail · EHI(01) ≥ 1 tornado · Craven > 20,000 sig. severe").classes(
+            "text-xs text-gray-600"
+        )
+
+    # Trend overview — one persistent widget, updated in place per analysis
+    # rather than torn down and recreated (rendered client-side by ECharts,
+    # so no server-side rasterization or image payloads are involved).
+    trend_chart = ui.echart({
+        "tooltip": {"trigger": "axis"},
+        "legend": {"data": ["MLCAPE (J/kg)", "0–6 km Shear (kt)"], "textStyle": {"color": "#9ca3af"}},
+        "xAxis": {"type": "category", "data": [], "axisLabel": {"color": "#9ca3af"}},
+        "yAxis": [
+            {"type": "value", "name": "J/kg", "axisLabel": {"color": "#9ca3af"}},
+            {"type": "value", "name": "kt", "axisLabel": {"color": "#9ca3af"}},
+        ],
+        "series": [
+            {"name": "MLCAPE (J/kg)", "type": "line", "smooth": True, "data": []},
+            {"name": "0–6 km Shear (kt)", "type": "line", "smooth": True, "yAxisIndex": 1, "data": []},
+        ],
+    }).classes("w-full max-w-3xl mx-auto h-64")
+    trend_chart.visible = False
+
+    # Results header — created once and updated via set_text per analysis;
+    # only the per-hour cards below are actually rebuilt on each run.
+    with ui.column().classes("w-full max-w-3xl mx-auto px-1 gap-0") as results_header:
+        results_title = ui.label("").classes("text-xl font-bold text-white mt-2")
+        results_meta  = ui.label("").classes("text-xs text-gray-500 mb-2")
+        spc_label     = ui.label("").classes("text-xs text-orange-300 mb-1")
+    results_header.visible = False
+
+    results_col = ui.column().classes("w-full max-w-3xl mx-auto p-1 gap-3 pb-16")
+
+    async def run_analysis():
+        global _last_trigger, _running, _last_analyses, _last_location
+        now = time.monotonic()
+        if _running:
+            ui.notify("Analysis already running…", type="info")
             return
-        lat, lon, display_name = geo
-
-    n_hours = int(hours_select.value)
-    min_score = int(min_score_select.value)
-
-    def _progress(msg):
-        status_bar.set_text(msg)
-
-    # Fetch profiles in thread pool (network I/O)
-    status_bar.set_text(f"Fetching model data for {display_name}…")
-    await asyncio.sleep(0.05)
-
-    profiles, source = await run.io_bound(
-        fetch_profiles, lat, lon, n_hours, _progress
-    )
-
-    if not profiles:
-        status_bar.set_text("❌ Could not fetch forecast data.")
-        analyze_btn.props(remove="loading")
-        return
+        if now - _last_trigger < DEBOUNCE_S:
+            return
+        _last_trigger = now
 
-    status_bar.set_text(f"Analyzing {len(profiles)} profiles from {source}…")
-    await asyncio.sleep(0.05)
+        raw = location_input.value.strip()
+        if not raw:
+            status_bar.set_text("⚠ Enter a location.")
+            return
 
-    # Analyze each profile
-    analyses = []
-    for prof in profiles:
-        a = await run.cpu_bound(analyze_profile, prof)
-        analyses.append(a)
+        _running = True
+        analyze_btn.disable()
+        analyze_btn.props("loading")
+        try:
+            results_col.clear()
+            status_bar.set_text("Starting analysis…")
+            await asyncio.sleep(0.05)
+
+            parsed = parse_latlon(raw)
+            if parsed is not None:
+                lat, lon, display_name = parsed
+            else:
+                lat, lon, display_name = None, None, raw
+                status_bar.set_text("Geocoding…")
+                await asyncio.sleep(0.05)
+                geo = await run.io_bound(geocode, raw)
+                if geo is None:
+                    status_bar.set_text("❌ Could not find location. Try 'lat, lon' format.")
+                    return
+                lat, lon, display_name = geo
+
+            n_hours = int(hours_select.value)
+            min_score = int(min_score_select.value)
+
+            def _progress(msg):
+                status_bar.set_text(msg)
+
+            # Fetch profiles in thread pool (network I/O)
+            status_bar.set_text(f"Fetching model data for {display_name}…")
+            await asyncio.sleep(0.05)
+
+            # SPC outlook (CONUS only; None elsewhere) is independent of the
+            # model fetch, so both run concurrently in the I/O pool.
+            (profiles, source), spc = await asyncio.gather(
+                run.io_bound(fetch_profiles, lat, lon, n_hours, _progress),
+                run.io_bound(get_spc_outlook, lat, lon),
+            )
+
+            if not profiles:
+                status_bar.set_text("❌ Could not fetch forecast data.")
+                return
+
+            status_bar.set_text(f"Analyzing {len(profiles)} profiles from {source}…")
+            await asyncio.sleep(0.05)
+
+            # Analyze the whole window in one worker round-trip
+            analyses = await run.cpu_bound(analyze_profiles, profiles)
+            _last_analyses = analyses
+            _last_location = display_name
+            export_btn.enable()
+
+            # Columnar pull of the plotted/summarized fields — the chart series
+            # and the window aggregates below share the same arrays, and the
+            # reductions run as C loops instead of per-hour Python max/sum.
+            n_steps = len(analyses)
+            cape_arr  = np.fromiter((a.mlcape for a in analyses), np.float64, count=n_steps)
+            shear_arr = np.fromiter((a.shear_06_kt for a in analyses), np.float64, count=n_steps)
+            stp_arr   = np.fromiter((a.stp for a in analyses), np.float64, count=n_steps)
+            score_arr = np.fromiter((a.support_score for a in analyses), np.int64, count=n_steps)
+
+            # Update the persistent trend chart in place
+            step_labels = [fmt_valid_time(a.valid_time, "%a %H:%M") for a in analyses]
+            trend_chart.options["xAxis"]["data"] = step_labels
+            trend_chart.options["series"][0]["data"] = np.rint(cape_arr).astype(int).tolist()
+            trend_chart.options["series"][1]["data"] = np.rint(shear_arr).astype(int).tolist()
+            trend_chart.update()
+            trend_chart.visible = True
+
+            # Update the persistent header labels in place
+            results_title.set_text(f"Environmental Analysis: {display_name}")
+            results_meta.set_text(
+                f"Model: {source}  ·  {n_steps} steps  ·  {n_hours}h window  ·  "
+                f"peak MLCAPE {cape_arr.max():.0f} J/kg  ·  max STP {stp_arr.max():.2f}  ·  "
+                f"{int(np.count_nonzero(score_arr >= 3))} hr(s) Moderate+"
+            )
+            spc_label.set_text(f"SPC Day 1 categorical outlook: {spc['name']} ({spc['label']})" if spc else "")
+            spc_label.visible = spc is not None
+            results_header.visible = True
+
+            # Filter first, then render only the qualifying hours; below-
+            # threshold hours (the common case with a strict filter) cost one
+            # comparison each, and the event loop gets a breather every few
+            # cards rather than after every one.
+            visible = [a for a in analyses if a.support_score >= min_score]
+            shown = len(visible)
+            card_times = [fmt_valid_time(a.valid_time, "%-I %p %a") for a in visible]
+            with results_col:
+                for i, a in enumerate(visible):
+                    render_analysis_card(a, show_notes=show_notes_toggle.value,
+                                         dt_str=card_times[i])
+                    if i % 5 == 4:
+                        await asyncio.sleep(0.01)  # keep UI responsive
+
+                if shown == 0:
+                    with ui.card().classes("w-full text-center p-8 bg-gray-900 border border-gray-700"):
+                        ui.label("No time steps meet the selected support threshold.").classes("text-gray-400")
+                        ui.label("Lower the 'Min. support level' filter to see all hours.").classes("text-xs text-gray-500 mt-1")
+
+            status_bar.set_text(f"✓ Complete — {shown} of {len(analyses)} hours displayed  ·  Source: {source}")
+        finally:
+            _running = False
+            analyze_btn.enable()
+            analyze_btn.props(remove="loading")
 
-    # Filter and render
-    shown = 0
-    with results_col:
-        ui.label(f"Environmental Analysis: {display_name}").classes("text-xl font-bold text-white mt-2")
-        ui.label(f"Model: {source}  ·  {len(analyses)} steps  ·  {n_hours}h window").classes("text-xs text-gray-500 mb-2")
 
-        for a in analyses:
-            if a.support_score < min_score:
-                continue
-            if not show_notes_toggle.value:
-                a.notes = []
-            render_analysis_card(a)
-            shown += 1
-            await asyncio.sleep(0.01)  # keep UI responsive
+    analyze_btn.on_click(run_analysis)
+    export_btn.on_click(export_csv)
+    location_input.on("keydown.enter", run_analysis)
 
-        if shown == 0:
-            with ui.card().classes("w-full text-center p-8 bg-gray-900 border border-gray-700"):
-                ui.label("No time steps meet the selected support threshold.").classes("text-gray-400")
-                ui.label("Lower the 'Min. support level' filter to see all hours.").classes("text-xs text-gray-500 mt-1")
 
-    status_bar.set_text(f"✓ Complete — {shown} of {len(analyses)} hours displayed  ·  Source: {source}")
-    analyze_btn.props(remove="loading")
+async def _warm_cpu_pool():
+    """
+    Spin up the cpu_bound worker pool (and its numpy/met_core imports)
+    during startup so the first Analyze click pays only fetch + analysis,
+    not process spawn and module import.
+    """
+    try:
+        await run.cpu_bound(analyze_profiles, [])
+    except Exception:
+        pass  # warm-up is best-effort; a real call will spawn the pool
 
 
-analyze_btn.on_click(run_analysis)
-location_input.on("keydown.enter", run_analysis)
+app.on_startup(_warm_cpu_pool)
 
-ui.run(title="Severe Wx Diagnostics", dark=True, port=8080)
+if __name__ in {"__main__", "__mp_main__"}:
+    ui.run(title="Severe Wx Diagnostics", dark=True, port=8080)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modules in src/ import each other flat (e.g. `from met_core import ...`),
+# so tests need src/ on the path the same way the app runs it.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
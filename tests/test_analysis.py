@@ -1 +1,76 @@
+from datetime import datetime, timezone
 
+from analysis_engine import EnvironmentAnalysis, _score_and_reason
+
+
+def _analysis(**kwargs) -> EnvironmentAnalysis:
+    a = EnvironmentAnalysis(
+        valid_time=datetime(2024, 5, 20, 21, tzinfo=timezone.utc),
+        source="TEST",
+    )
+    for key, val in kwargs.items():
+        setattr(a, key, val)
+    return a
+
+
+def test_no_instability_scores_zero():
+    a = _analysis(mlcape=50.0, mucape=100.0)
+    _score_and_reason(a)
+    assert a.support_score == 0
+    assert a.support_label == "None"
+    assert a.convective_mode == "No Convective Threat"
+
+
+def test_high_end_environment_scores_extreme():
+    a = _analysis(
+        mlcape=3000.0, mucape=3500.0, mlcin=-20.0,
+        ml_lcl_hgt=700.0, shear_06_kt=55.0, shear_01_kt=30.0,
+        srh_01=350.0, srh_03=450.0, srh_eff=450.0,
+        scp=8.0, stp=3.0, lapse_700_500=7.5, lapse_sfc_700=7.0,
+        rh_sfc=70.0, pw_mm=35.0,
+    )
+    _score_and_reason(a)
+    assert a.support_score == 5
+    assert a.support_label == "Extreme"
+    assert "Tornadic" in a.convective_mode
+
+
+def test_weak_shear_caps_score():
+    a = _analysis(mlcape=2000.0, mucape=2200.0, shear_06_kt=10.0,
+                  rh_sfc=65.0, lapse_sfc_700=6.5)
+    _score_and_reason(a)
+    assert a.convective_mode == "Pulse / Single Cell"
+    assert a.support_score <= 2
+    assert any("shear" in f.lower() for f in a.fail_modes)
+
+
+def test_analyze_profile_end_to_end():
+    import json
+    import os
+
+    import numpy as np
+
+    from analysis_engine import analyze_profile
+    from data_fetcher import SoundingProfile
+    from met_core import dir_spd_to_uv_vec
+
+    path = os.path.join(os.path.dirname(__file__), "fixtures", "sample_profile.json")
+    with open(path) as f:
+        raw = json.load(f)
+    u, v = dir_spd_to_uv_vec(np.array(raw["wind_dir_deg"]), np.array(raw["wind_spd_kt"]))
+    profile = SoundingProfile(
+        valid_time=datetime(2024, 5, 20, 21, tzinfo=timezone.utc),
+        source="TEST", lat=35.2, lon=-97.4,
+        p_hpa=np.array(raw["p_hpa"]), t_c=np.array(raw["t_c"]),
+        td_c=np.array(raw["td_c"]), heights_m_agl=np.array(raw["heights_m_agl"]),
+        u_kt=u, v_kt=v,
+        t_sfc_c=raw["t_sfc_c"], td_sfc_c=raw["td_sfc_c"], p_sfc_hpa=raw["p_sfc_hpa"],
+    )
+
+    a = analyze_profile(profile)
+    assert a.mlcape > 2000
+    assert a.shear_06_kt > 50
+    assert a.srh_01 > 100
+    assert a.scp > 2
+    assert a.support_score >= 4
+    assert "Supercell" in a.convective_mode or "Tornadic" in a.convective_mode
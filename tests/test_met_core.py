@@ -1 +1,99 @@
+import math
 
+import numpy as np
+
+import met_core
+
+
+def test_dir_spd_to_uv_vec_matches_scalar():
+    dirs = np.array([0.0, 45.0, 90.0, 180.0, 270.0, 359.0])
+    spds = np.array([10.0, 20.0, 5.0, 30.0, 15.0, 40.0])
+    u_vec, v_vec = met_core.dir_spd_to_uv_vec(dirs, spds)
+    for i in range(len(dirs)):
+        u, v = met_core.dir_spd_to_uv(float(dirs[i]), float(spds[i]))
+        assert math.isclose(u_vec[i], u, abs_tol=1e-9)
+        assert math.isclose(v_vec[i], v, abs_tol=1e-9)
+
+
+def test_compute_srh_layers_matches_single_layer():
+    h = np.array([0.0, 250.0, 500.0, 1000.0, 2000.0, 3000.0, 6000.0])
+    u = np.array([5.0, 8.0, 12.0, 18.0, 25.0, 30.0, 40.0])
+    v = np.array([10.0, 14.0, 16.0, 20.0, 22.0, 24.0, 20.0])
+    layered = met_core.compute_srh_layers(h, u, v, 20.0, 5.0, layer_tops_m=(1000.0, 3000.0))
+    for top in (1000.0, 3000.0):
+        single = met_core.compute_srh(h, u, v, 20.0, 5.0, layer_top_m=top)
+        assert math.isclose(layered[top], single, abs_tol=1e-9)
+
+
+def test_precipitable_water_matches_scalar_integration():
+    p  = np.array([1000.0, 925.0, 850.0, 700.0, 500.0, 300.0])
+    td = np.array([20.0, 16.0, 12.0, 4.0, -12.0, -35.0])
+    expected = 0.0
+    for i in range(len(p) - 1):
+        w1 = met_core.mixing_ratio_from_dewpoint(float(td[i]),   float(p[i]))
+        w2 = met_core.mixing_ratio_from_dewpoint(float(td[i+1]), float(p[i+1]))
+        dp = abs(float(p[i]) - float(p[i+1])) * 100
+        expected += (w1 + w2) / 2 * dp / met_core.g
+    assert math.isclose(met_core.precipitable_water(p, td), round(expected * 1000, 1), abs_tol=0.11)
+
+
+def test_uv_roundtrip():
+    dirn, spd = met_core.uv_to_dir_spd(*met_core.dir_spd_to_uv(240.0, 35.0))
+    assert math.isclose(dirn, 240.0, abs_tol=1e-6)
+    assert math.isclose(spd, 35.0, abs_tol=1e-6)
+
+
+def _severe_profile():
+    import json, os
+    path = os.path.join(os.path.dirname(__file__), "fixtures", "sample_profile.json")
+    with open(path) as f:
+        raw = json.load(f)
+    h = np.array(raw["heights_m_agl"])
+    u, v = met_core.dir_spd_to_uv_vec(
+        np.array(raw["wind_dir_deg"]), np.array(raw["wind_spd_kt"]))
+    return raw, h, u, v
+
+
+def test_cape_cin_severe_sounding():
+    raw, _, _, _ = _severe_profile()
+    r = met_core.compute_cape_cin(
+        np.array(raw["p_hpa"]), np.array(raw["t_c"]), np.array(raw["td_c"]),
+        p_sfc=raw["p_sfc_hpa"])
+    assert 2000 < r["mlcape"] < 6000
+    assert r["mucape"] >= r["mlcape"]
+    assert -150 < r["mlcin"] <= 0
+
+
+def test_bunkers_right_mover_rightward_of_mean_wind():
+    _, h, u, v = _severe_profile()
+    b = met_core.bunkers_storm_motion(h, u, v)
+    # Right-mover deviates clockwise (to the right) of the mean wind
+    cross = b["mean_u"] * b["rm_v"] - b["mean_v"] * b["rm_u"]
+    assert cross < 0
+    dev = math.hypot(b["rm_u"] - b["mean_u"], b["rm_v"] - b["mean_v"])
+    assert math.isclose(dev, 14.6, rel_tol=1e-6)
+
+
+def test_srh_positive_for_veering_profile():
+    _, h, u, v = _severe_profile()
+    b = met_core.bunkers_storm_motion(h, u, v)
+    srh = met_core.compute_srh_layers(h, u, v, b["rm_u"], b["rm_v"])
+    assert srh[1000.0] > 100
+    assert srh[3000.0] > srh[1000.0]
+
+def test_composites_vectorize_over_hours():
+    cape  = np.array([0.0, 800.0, 2500.0, 4000.0])
+    srh   = np.array([0.0, 150.0, 300.0, 450.0])
+    shear = np.array([5.0, 35.0, 50.0, 65.0])
+    lcl   = np.array([2500.0, 1200.0, 800.0, 600.0])
+    cin   = np.array([-300.0, -80.0, -30.0, -5.0])
+
+    scp = met_core.supercell_composite(cape, srh, shear)
+    stp = met_core.significant_tornado_parameter(cape, lcl, srh, shear, cin)
+    ehi = met_core.energy_helicity_index(cape, srh)
+    for i in range(len(cape)):
+        assert scp[i] == met_core.supercell_composite(
+            float(cape[i]), float(srh[i]), float(shear[i]))
+        assert stp[i] == met_core.significant_tornado_parameter(
+            float(cape[i]), float(lcl[i]), float(srh[i]), float(shear[i]), float(cin[i]))
+        assert ehi[i] == met_core.energy_helicity_index(float(cape[i]), float(srh[i]))